@@ -0,0 +1,109 @@
+# coding: utf-8
+
+from __future__ import print_function, unicode_literals
+import sys, random, timeit, subprocess
+from hazm import *
+from hazm.utils import words_list
+
+
+def elongated_text(length, ratio=0.5, seed=0):
+    """synthetic social-media text in which about `ratio` of words are elongated."""
+
+    rand = random.Random(seed)
+    words = [item[0] for item in words_list() if " " not in item[0]]
+    tokens, size = [], 0
+    while size < length:
+        word = rand.choice(words)
+        if rand.random() < ratio:
+            i = rand.randrange(len(word))
+            word = word[:i] + word[i] * rand.randint(3, 8) + word[i + 1 :]
+        tokens.append(word)
+        size += len(word) + 1
+    return " ".join(tokens)
+
+
+def benchmark_decrease_repeated_chars():
+    normalizer = Normalizer()
+
+    for length in [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]:
+        text = elongated_text(length)
+        elapsed = min(
+            timeit.repeat(
+                lambda: normalizer.decrease_repeated_chars(text),
+                setup=normalizer._repeated_words.clear,
+                number=1,
+                repeat=3,
+            )
+        )
+        print(
+            "decrease_repeated_chars: %8d chars in %.4fs (%.2f us/char)"
+            % (len(text), elapsed, elapsed * 10 ** 6 / len(text))
+        )
+
+
+def benchmark_word_tokenizer():
+    rand = random.Random(0)
+    words = [item[0] for item in words_list()]
+    marks = [".", "،", "!", "؟", ":", "(", ")", "«", "»", "12", "3.5", "22:00"]
+    text = " ".join(
+        rand.choice(words) + (rand.choice(marks) if rand.random() < 0.15 else "")
+        for i in range(200000)
+    )
+
+    for options in [{}, {"join_verb_parts": False}, {"replace_numbers": True}]:
+        tokenizer = WordTokenizer(**options)
+        elapsed = min(
+            timeit.repeat(lambda: tokenizer.tokenize(text), number=1, repeat=3)
+        )
+        print("tokenize %s: %d chars in %.4fs" % (options, len(text), elapsed))
+
+
+def import_time(statement, repeat=5):
+    """seconds a fresh interpreter spends on `statement`, and the modules it loads."""
+
+    code = (
+        "import sys, time; start = time.time(); %s; "
+        "print(time.time() - start); print(' '.join(sys.modules))" % statement
+    )
+    runs = [
+        subprocess.check_output([sys.executable, "-c", code]).decode().split("\n")
+        for i in range(repeat)
+    ]
+    return min(float(run[0]) for run in runs), set(runs[0][1].split())
+
+
+def benchmark_import():
+    # these should only be loaded when a component that needs them is used
+    heavy = [
+        "nltk",
+        "nltk.parse",
+        "nltk.chunk",
+        "nltk.tag.stanford",
+        "xml.dom.minidom",
+    ]
+
+    for statement in [
+        "import hazm",
+        "from hazm import word_tokenize; word_tokenize('سلام')",
+        "from hazm import Normalizer",
+        "from hazm import *",
+    ]:
+        elapsed, modules = import_time(statement)
+        loaded = [module for module in heavy if module in modules]
+        print("%.4fs %s (%s)" % (elapsed, statement, ", ".join(loaded) or "-"))
+        if statement == "import hazm":
+            assert not loaded, "import hazm should not load " + ", ".join(loaded)
+
+
+benchmarks = {
+    "decrease_repeated_chars": benchmark_decrease_repeated_chars,
+    "word_tokenizer": benchmark_word_tokenizer,
+    "import": benchmark_import,
+}
+
+
+if __name__ == "__main__":
+    # run all benchmarks if no one specified
+    for name, benchmark in benchmarks.items():
+        if len(sys.argv) < 2 or name in sys.argv:
+            benchmark()
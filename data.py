@@ -9,6 +9,7 @@ from nltk.tag import untag
 from sklearn.model_selection import train_test_split
 from hazm import *
 from hazm.Chunker import tree2brackets
+from hazm.utils import build_lexicon
 from hazm.PeykareReader import coarse_pos_e as peykare_coarse_pos_e
 from hazm.DadeganReader import coarse_pos_e as dadegan_coarse_pos_e
 from hazm import Normalizer
@@ -32,6 +33,13 @@ def create_words_file(dic_file="resources/persian.dic", output="hazm/data/words.
     print(output, "created")
 
 
+def create_lexicon_file(output="hazm/data/lexicon.bin"):
+    """compiles hazm data files into a memory-mappable lexicon, rerun it after editing any of them."""
+
+    build_lexicon(output)
+    print(output, "created")
+
+
 def evaluate_lemmatizer(
     conll_file="resources/train.conll", peykare_root="corpora/peykare"
 ):
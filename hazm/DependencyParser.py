@@ -5,10 +5,11 @@
 """
 
 from __future__ import print_function, unicode_literals
-import os, codecs, tempfile
+import os, codecs, shutil, tempfile, subprocess, threading
 from nltk.parse import DependencyGraph
 from nltk.parse.api import ParserI
 from nltk.parse.malt import MaltParser
+from .utils import data_path
 
 
 class MaltParser(MaltParser):
@@ -19,17 +20,36 @@ class MaltParser(MaltParser):
         lemmatizer (str): نام کلاس ریشه‌یاب.
         working_dir (str, optional): محل ذخیره‌سازی `maltparser‍`.
         model_file (str, optional): آدرس مدلِ از پیش آموزش دیده با پسوند `mco`.
+        persistent (bool, optional): اگر `True` باشد به‌جای اجرای جاوا در هر
+            فراخوانی، یک پردازهٔ جاوا با مدل بارگذاری‌شده در پس‌زمینه نگه
+            داشته می‌شود. این حالت به `javac` نیاز دارد؛ پردازه در صورت از کار
+            افتادن دوباره اجرا می‌شود و با [close()][hazm.DependencyParser.MaltParser.close]
+            یا پایان بلوک `with` بسته می‌شود.
     
     """
 
     def __init__(
-        self, tagger, lemmatizer, working_dir="resources", model_file="langModel.mco"
+        self,
+        tagger,
+        lemmatizer,
+        working_dir="resources",
+        model_file="langModel.mco",
+        persistent=False,
     ):
         self.tagger = tagger
         self.working_dir = working_dir
         self.mco = model_file
         self._malt_bin = os.path.join(working_dir, "malt.jar")
         self.lemmatize = lemmatizer.lemmatize if lemmatizer else lambda w, t: "_"
+        self.persistent = persistent
+        self._server = None
+        self._server_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     def parse_sents(self, sentences, verbose=False):
         """گراف وابستگی را برمی‌گرداند.
@@ -59,6 +79,9 @@ class MaltParser(MaltParser):
             Exception: در صورت بروز خطا یک اکسپشن عمومی صادر می‌شود.
         
         """
+        if self.persistent:
+            return self._parse_with_server(sentences)
+
         input_file = tempfile.NamedTemporaryFile(
             prefix="malt_input.conll", dir=self.working_dir, delete=False
         )
@@ -68,29 +91,8 @@ class MaltParser(MaltParser):
 
         try:
             for sentence in sentences:
-                for i, (word, tag) in enumerate(sentence, start=1):
-                    word = word.strip()
-                    if not word:
-                        word = "_"
-                    input_file.write(
-                        (
-                            "\t".join(
-                                [
-                                    str(i),
-                                    word.replace(" ", "_"),
-                                    self.lemmatize(word, tag).replace(" ", "_"),
-                                    tag,
-                                    tag,
-                                    "_",
-                                    "0",
-                                    "ROOT",
-                                    "_",
-                                    "_",
-                                    "\n",
-                                ]
-                            )
-                        ).encode("utf8")
-                    )
+                for line in self.conll_lines(sentence):
+                    input_file.write((line + "\t\n").encode("utf8"))
                 input_file.write("\n\n".encode("utf8"))
             input_file.close()
 
@@ -126,6 +128,104 @@ class MaltParser(MaltParser):
             output_file.close()
             os.remove(output_file.name)
 
+    def conll_lines(self, sentence):
+        """سطرهای ورودی جمله را در قالب CoNLL می‌سازد.
+        
+        Args:
+            sentence (List[Tuple[str,str]]): جمله در قالب لیستی از `(توکن، برچسب)`ها.
+        
+        Returns:
+            (List[str]): سطر هر توکن که ستون‌های آن با `\\t` از هم جدا شده‌اند.
+        
+        """
+        lines = []
+        for i, (word, tag) in enumerate(sentence, start=1):
+            word = word.strip()
+            if not word:
+                word = "_"
+            lines.append(
+                "\t".join(
+                    [
+                        str(i),
+                        word.replace(" ", "_"),
+                        self.lemmatize(word, tag).replace(" ", "_"),
+                        tag,
+                        tag,
+                        "_",
+                        "0",
+                        "ROOT",
+                        "_",
+                        "_",
+                    ]
+                )
+            )
+        return lines
+
+    def _start_server(self):
+        working_dir = os.path.abspath(self.working_dir)
+        source = os.path.join(data_path, "MaltServer.java")
+        compiled = os.path.join(working_dir, "MaltServer.class")
+        malt_bin = os.path.abspath(self._malt_bin)
+        if not os.path.exists(compiled) or os.path.getmtime(
+            compiled
+        ) < os.path.getmtime(source):
+            subprocess.check_call(["javac", "-cp", malt_bin, "-d", working_dir, source])
+
+        self._server = subprocess.Popen(
+            ["java", "-cp", os.pathsep.join([malt_bin, working_dir])]
+            + ["MaltServer", self.mco],
+            cwd=working_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def _request(self, lines):
+        # each message is the number of lines followed by the lines themselves
+        server = self._server
+        message = [str(len(lines))] + lines
+        server.stdin.write("".join(line + "\n" for line in message).encode("utf8"))
+        server.stdin.flush()
+        count = int(server.stdout.readline())
+        return [
+            server.stdout.readline().decode("utf8").rstrip("\r\n") for i in range(count)
+        ]
+
+    def _parse_with_server(self, sentences):
+        graphs = []
+        with self._server_lock:
+            for sentence in sentences:
+                lines = self.conll_lines(sentence)
+                for attempt in range(2):
+                    if self._server is None or self._server.poll() is not None:
+                        self._start_server()
+                    try:
+                        parsed = self._request(lines)
+                        break
+                    except (IOError, OSError, ValueError):
+                        # the parser has crashed, start it again once
+                        self.close()
+                        if attempt:
+                            raise Exception("MaltParser server failed")
+                graphs.append(DependencyGraph("\n".join(parsed)))
+        return iter(graphs)
+
+    def close(self):
+        """پردازهٔ جاوای پس‌زمینه را در حالت `persistent` می‌بندد.
+        
+        """
+        server, self._server = self._server, None
+        if server is None:
+            return
+        try:
+            server.stdin.close()
+            server.wait(timeout=10)
+        except Exception:
+            server.kill()
+            server.wait()
+        finally:
+            server.stdout.close()
+
 
 class TurboParser(ParserI):
     """
@@ -140,65 +240,68 @@ class TurboParser(ParserI):
 
         import turboparser
 
+        self.model_file = model_file
         self._pturboparser = turboparser.PTurboParser()
         self.interface = self._pturboparser.create_parser()
         self.interface.load_parser_model(model_file)
+        # TurboParser interfaces are not thread safe, each thread loads its own
+        self._local = threading.local()
+        self._local.interface = self.interface
+        self._interface_lock = threading.Lock()
+
+    conll_lines = MaltParser.conll_lines
+
+    def _thread_interface(self):
+        interface = getattr(self._local, "interface", None)
+        if interface is None:
+            with self._interface_lock:
+                interface = self._pturboparser.create_parser()
+            interface.load_parser_model(self.model_file)
+            self._local.interface = interface
+        return interface
 
     def parse_sents(self, sentences):
         tagged_sentences = self.tagger.tag_sents(sentences)
         return self.tagged_parse_sents(tagged_sentences)
 
     def tagged_parse_sents(self, sentences):
-        input_file = tempfile.NamedTemporaryFile(
-            prefix="turbo_input.conll", dir="resources", delete=False
-        )
-        output_file = tempfile.NamedTemporaryFile(
-            prefix="turbo_output.conll", dir="resources", delete=False
+        # a private directory keeps concurrent calls apart; it is in shared memory
+        # when the system has one, so the files never reach the disk
+        shared_memory = "/dev/shm"
+        directory = tempfile.mkdtemp(
+            prefix="turbo", dir=shared_memory if os.path.isdir(shared_memory) else None
         )
+        input_name = os.path.join(directory, "input.conll")
+        output_name = os.path.join(directory, "output.conll")
 
         try:
-            for sentence in sentences:
-                for i, (word, tag) in enumerate(sentence, start=1):
-                    word = word.strip()
-                    if not word:
-                        word = "_"
-                    input_file.write(
-                        (
-                            "\t".join(
-                                [
-                                    str(i),
-                                    word.replace(" ", "_"),
-                                    self.lemmatize(word, tag).replace(" ", "_"),
-                                    tag,
-                                    tag,
-                                    "_",
-                                    "0",
-                                    "ROOT",
-                                    "_",
-                                    "_",
-                                    "\n",
-                                ]
-                            )
-                        ).encode("utf8")
-                    )
-                input_file.write("\n".encode("utf8"))
-            input_file.close()
+            with open(input_name, "wb") as input_file:
+                for sentence in sentences:
+                    lines = [line + "\t\n" for line in self.conll_lines(sentence)]
+                    input_file.write(("".join(lines) + "\n").encode("utf8"))
 
-            self.interface.parse(input_file.name, output_file.name)
+            self._thread_interface().parse(input_name, output_name)
 
-            return (
-                DependencyGraph(item, cell_extractor=lambda cells: cells[1:8])
-                for item in codecs.open(output_file.name, encoding="utf8")
-                .read()
-                .split("\n\n")
-                if item.strip()
-            )
+            # the output is read before the directory is removed, so nothing
+            # is left behind however much of the result is used
+            items, lines = [], []
+            with codecs.open(output_name, encoding="utf8") as output_file:
+                for line in output_file:
+                    if line.strip():
+                        lines.append(line)
+                    elif lines:
+                        items.append("".join(lines))
+                        lines = []
+            if lines:
+                items.append("".join(lines))
 
         finally:
-            input_file.close()
-            os.remove(input_file.name)
-            output_file.close()
-            os.remove(output_file.name)
+            shutil.rmtree(directory, ignore_errors=True)
+
+        return (
+            DependencyGraph(item, cell_extractor=lambda cells: cells[1:8])
+            for item in items
+        )
 
 
 class DependencyParser(MaltParser):
@@ -5,8 +5,14 @@
 """
 
 from __future__ import unicode_literals
-import codecs
-from .utils import informal_verbs, informal_words, NUMBERS, default_verbs
+from .utils import (
+    informal_verbs,
+    informal_words,
+    NUMBERS,
+    default_verbs,
+    read_lines,
+    shared_lexicon,
+)
 from .Normalizer import Normalizer
 from .Lemmatizer import Lemmatizer
 from .Stemmer import Stemmer
@@ -37,21 +43,22 @@ class InformalNormalizer(Normalizer):
         self.ilemmatizer = InformalLemmatizer()
         self.stemmer = Stemmer()
         super(InformalNormalizer, self).__init__(**kargs)
+        self._options.update(
+            verb_file=verb_file, word_file=word_file, seperation_flag=seperation_flag
+        )
 
         self.sent_tokenizer = SentenceTokenizer()
         self.word_tokenizer = WordTokenizer()
 
-        with codecs.open(verb_file, encoding="utf8") as vf:
-            self.pastVerbs = {}
-            self.presentVerbs = {}
-            for f, i, flag in map(lambda x: x.strip().split(" ", 2), vf):
-                splitedF = f.split("#")
-                self.presentVerbs.update({i: splitedF[1]})
-                self.pastVerbs.update({splitedF[0]: splitedF[0]})
-        with codecs.open(default_verbs, encoding="utf8") as vf:
-            for f, i in map(lambda x: x.strip().split("#", 2), vf):
-                self.presentVerbs.update({i: i})
-                self.pastVerbs.update({f: f})
+        self.pastVerbs = {}
+        self.presentVerbs = {}
+        for f, i, flag in map(lambda x: x.split(" ", 2), read_lines(verb_file)):
+            splitedF = f.split("#")
+            self.presentVerbs.update({i: splitedF[1]})
+            self.pastVerbs.update({splitedF[0]: splitedF[0]})
+        for f, i in map(lambda x: x.split("#", 2), read_lines(default_verbs)):
+            self.presentVerbs.update({i: i})
+            self.pastVerbs.update({f: f})
 
         def informal_to_formal_conjucation(i, f, flag):
             iv = self.informal_conjugations(i)
@@ -76,13 +83,17 @@ class InformalNormalizer(Normalizer):
 
             return res
 
-        with codecs.open(verb_file, encoding="utf8") as vf:
-            self.iverb_map = {}
-            for f, i, flag in map(lambda x: x.strip().split(" ", 2), vf):
-                self.iverb_map.update(informal_to_formal_conjucation(i, f, flag))
+        def load_iverb_map():
+            iverb_map = {}
+            for f, i, flag in map(lambda x: x.split(" ", 2), read_lines(verb_file)):
+                iverb_map.update(informal_to_formal_conjucation(i, f, flag))
+            return iverb_map
+
+        def load_iword_map():
+            return dict(map(lambda x: x.split(" ", 1), read_lines(word_file)))
 
-        with codecs.open(word_file, encoding="utf8") as wf:
-            self.iword_map = dict(map(lambda x: x.strip().split(" ", 1), wf))
+        self.iverb_map = shared_lexicon("iverb_map", [verb_file], load_iverb_map)
+        self.iword_map = shared_lexicon("iword_map", [word_file], load_iword_map)
 
         self.words = set()
         if self.seperation_flag:
@@ -94,6 +105,227 @@ class InformalNormalizer(Normalizer):
             self.words.update(self.lemmatizer.verbs.keys())
             self.words.update(self.lemmatizer.verbs.values())
 
+        self._split_limit = 5000
+
+        # the suffixes normalized_word looks for, each mapped to its rank in the
+        # order they are tried
+        self._end_words = {
+            end: rank
+            for rank, end in enumerate(
+                [
+                    "هاست",
+                    "هایی",
+                    "هایم",
+                    "ترین",
+                    "ایی",
+                    "انی",
+                    "شان",
+                    "شون",
+                    "است",
+                    "تان",
+                    "تون",
+                    "مان",
+                    "مون",
+                    "هام",
+                    "هاش",
+                    "های",
+                    "طور",
+                    "ها",
+                    "تر",
+                    "ئی",
+                    "یی",
+                    "یم",
+                    "ام",
+                    "ای",
+                    "ان",
+                    "هم",
+                    "رو",
+                    "یت",
+                    "ه",
+                    "ی",
+                    "ش",
+                    "و",
+                    "ا",
+                    "ت",
+                    "م",
+                ]
+            )
+        }
+        self._end_verbs = {
+            end: rank
+            for rank, end in enumerate(
+                [
+                    "یم",
+                    "دم",
+                    "دیم",
+                    "ید",
+                    "دی",
+                    "دید",
+                    "ند",
+                    "دن",
+                    "دند",
+                    "ین",
+                    "دین",
+                    "ست",
+                    "ستم",
+                    "ستی",
+                    "ستیم",
+                    "ستید",
+                    "ستند",
+                    "ستن",
+                    "م",
+                    "ی",
+                    "ه",
+                    "د",
+                    "ن",
+                ]
+            )
+        }
+        self._max_ending = max(map(len, list(self._end_words) + list(self._end_verbs)))
+        self._joining_letters = set("بپتثجچحخسشصضعغفقکگلمنهی")
+        self._straight_forward_words = {
+            "ب": ["به"],
+            "ک": ["که"],
+            "آن": ["آن"],
+            "می‌آید": ["می‌آید"],
+            "میاید": ["می‌آید"],
+            "می‌آیم": ["می‌آیم"],
+            "میایم": ["می‌آیم"],
+            "نمی‌آید": ["نمی‌آید"],
+            "نمیاید": ["نمی‌آید"],
+            "نمی‌آیم": ["نمی‌آیم"],
+            "نمیایم": ["نمی‌آیم"],
+            "برمی‌آید": ["برمی‌آید"],
+            "برمیاید": ["برمی‌آید"],
+            "برمی‌آیم": ["برمی‌آیم"],
+            "برمیایم": ["برمی‌آیم"],
+            "برنمی‌آید": ["برنمی‌آید"],
+            "برنمیاید": ["برنمی‌آید"],
+            "برنمی‌آیم": ["برنمی‌آیم"],
+            "برنمیایم": ["برنمی‌آیم"],
+            "منظوره": ["منظوره"],
+            "بدن": ["بدن"],
+            "میا": ["میا"],
+            "نیس": ["نیست"],
+            "فک": ["فکر"],
+            "برام": ["برایم"],
+            "آ": ["آ"],
+            "آی": ["آی"],
+            "این": ["این"],
+            "است": ["است"],
+            "ان": ["ان"],
+            "اند": ["اند"],
+            "میان": ["میان"],
+            "گردن": ["گردن"],
+            "اینهمه": ["اینهمه"],
+            "آنهمه": ["آنهمه"],
+            "الیه": ["الیه"],
+            "غرغره": ["غرغره"],
+            "لیله": ["لیله"],
+            "بزرگانه": ["بزرگانه"],
+            "پرستانه": ["پرستانه"],
+            "ام": ["ام"],
+            "بادی": ["بادی"],
+            "نان": ["نان"],
+            "باورم": ["باورم"],
+            "اوه": ["اوه"],
+            "چقد": ["چقدر"],
+            "چو": ["چون"],
+            "هس": ["هست"],
+            "اومدند": ["آمدند"],
+            "ش": ["اش"],
+            "بش": ["بهش"],
+            "ازت": ["از تو"],
+            "رو": ["را", "رو"],
+            "پایتون": ["پایتون"],
+            "اردن": ["اردن"],
+            "دست": ["دست"],
+            "دستی": ["دستی"],
+            "دستم": ["دستم"],
+            "دین": ["دین"],
+            "شین": ["شین"],
+            "سراتو": ["سراتو"],
+            "فالو": ["فالو"],
+            "هرجا": ["هرجا"],
+            "میدان": ["میدان"],
+            "میدون": ["میدان"],
+            "کفا": ["کفا"],
+            "ویا": ["و یا"],
+            "نشد": ["نشد"],
+            "شو": ["شو"],
+            "مشیا": ["مشیا"],
+            "پلاسما": ["پلاسما"],
+            "فیلیمو": ["فیلیمو"],
+            "پاشو": ["پاشو"],
+            "میر": ["میر"],
+            "بارم": ["بار هم", "بارم"],
+            "برند": ["برند"],
+            "کنه": ["کند"],
+            "بتونه": ["بتواند"],
+            "باشه": ["باشد"],
+            "بخوان": ["بخوان"],
+            "بدم": ["بدم"],
+            "برم": ["برم"],
+            "بده": ["بده"],
+            "نده": ["نده"],
+            "شهرو": ["شهرو"],
+            "شیرو": ["شیرو"],
+            "نگذاشته": ["نگذاشته"],
+            "نگرفته": ["نگرفته"],
+            "نمیشناخته": ["نمی‌شناخته"],
+            "نمی‌شناخته": ["نمی‌شناخته"],
+            "بشین": ["بشین"],
+            "هارو": ["ها را"],
+            "مارو": ["ما را"],
+            "میاومد": ["می‌آمد"],
+            "می‌اومد": ["می‌آمد"],
+            "میخواسته": ["می‌خواسته"],
+            "می‌خواسته": ["می‌خواسته"],
+            "نمیخواسته": ["نمی‌خواسته"],
+            "نمی‌خواسته": ["نمی‌خواسته"],
+            "میتوانسته": ["می‌توانسته"],
+            "می‌توانسته": ["می‌توانسته"],
+            "میرفته": ["می‌رفته"],
+            "می‌رفته": ["می‌رفته"],
+            "نشین": ["نشین"],
+            "انا": ["انا"],
+            "خونی": ["خونی"],
+            "خون": ["خون"],
+            "یالا": ["یالا"],
+            "میخواند": ["می‌خواند"],
+            "می‌خواند": ["می‌خواند"],
+            "نمیخواند": ["نمی‌خواند"],
+            "نمی‌خواند": ["نمی‌خواند"],
+            "میده": ["می‌دهد"],
+            "می‌ده": ["می‌دهد"],
+            "میشه": ["می‌شود"],
+            "می‌شه": ["می‌شود"],
+            "میشد": ["می‌شد"],
+            "می‌شد": ["می‌شد"],
+            "میشدم": ["می‌شدم"],
+            "می‌شدم": ["می‌شدم"],
+            "نمیشد": ["نمی‌شد"],
+            "نمی‌شد": ["نمی‌شد"],
+            "بردم": ["بردم"],
+            "بره": ["بره", "برود"],
+            "شم": ["بشوم"],
+            "اوست": ["اوست"],
+            "بیا": ["بیا"],
+            "نیا": ["نیا"],
+            "میاد": ["می‌آید"],
+            "نشدی": ["نشدی"],
+            "بخواند": ["بخواند"],
+            "سیا": ["سیا"],
+            "میدید": ["می‌دید"],
+            "می‌دید": ["می‌دید"],
+            "وا": ["وا"],
+            "برگشته": ["برگشته"],
+            "میخواست": ["می‌خواست"],
+            "می‌خواست": ["می‌خواست"],
+        }
+        self._normalized_words = {}
+        self._normalized_words_limit = 100000
+
     def split_token_words(self, token):
         """هرجایی در متن فاصله نیاز بود قرار می‌دهد.
         
@@ -102,6 +334,16 @@ class InformalNormalizer(Normalizer):
         شکل نوشته می‌شود: «تورادوست دارم.» این تابع فواصل ضروری را در متن
         ایجاد می‌کند و آن را به شکل صحیح برمی‌گرداند.
         
+        توکن فقط پس از حروفی که به حرف بعد نمی‌چسبند شکسته می‌شود و از میان
+        تجزیه‌هایی که همهٔ بخش‌هایشان کلمه‌اند، آنکه کمترین تعداد کلمه را دارد
+        انتخاب می‌شود. برای توکن‌های بسیار بلند اگر بیش از `_split_limit` بخش
+        بررسی شود، توکن بدون فاصله‌گذاری برگردانده می‌شود.
+        
+        Examples:
+            >>> normalizer = InformalNormalizer(seperation_flag=True)
+            >>> normalizer.split_token_words('تورادوست')
+            'تو را دوست'
+        
         Args:
             token (str): توکنی که باید فاصله‌گذاری شود.
         
@@ -110,40 +352,57 @@ class InformalNormalizer(Normalizer):
         
         """
 
-        def shekan(token):
-            res = [""]
-            for i in token:
-                res[-1] += i
-                if i in set(["ا", "د", "ذ", "ر", "ز", "ژ", "و"] + list(NUMBERS)):
-                    res.append("")
-            while "" in res:
-                res.remove("")
-            return res
-
-        def perm(lst):
-            if len(lst) > 1:
-                up = perm(lst[1:])
-            else:
-                return [lst]
-            res = []
-            for i in up:
-                res.append([lst[0]] + i)
-                res.append([lst[0] + i[0]] + i[1:])
-            res.sort(key=len)
-            return res
-
         token = re.sub(r"(.)\1{2,}", r"\1", token)
-        ps = perm(shekan(token))
-        for c in ps:
-            if set(map(lambda x: self.ilemmatizer.lemmatize(x), c)).issubset(
-                self.words
-            ):
-                return " ".join(c)
-        return token
+
+        # the token is only split after the letters that do not join the next one
+        separators = "ادذرزژو" + NUMBERS
+        chunks = re.findall(r"[^{0}]*[{0}]|[^{0}]+".format(separators), token)
+        n = len(chunks)
+
+        checks = [0]
+        valid = {}
+
+        def is_valid(start, stop):
+            if (start, stop) not in valid:
+                checks[0] += 1
+                part = "".join(chunks[start:stop])
+                valid[start, stop] = self.ilemmatizer.lemmatize(part) in self.words
+            return valid[start, stop]
+
+        # parts[start] is the least number of words chunks[start:] splits into
+        parts = [None] * n + [0]
+        for start in reversed(range(n)):
+            for stop in range(start + 1, n + 1):
+                if parts[stop] is None or (
+                    parts[start] is not None and parts[stop] + 1 >= parts[start]
+                ):
+                    continue
+                if is_valid(start, stop):
+                    parts[start] = parts[stop] + 1
+                if checks[0] > self._split_limit:
+                    return token
+
+        if parts[0] is None:
+            return token
+
+        # among the splits with the fewest words, the one with the shortest
+        # first word, then the shortest second word and so on is chosen
+        words, start = [], 0
+        while start < n:
+            stop = next(
+                stop
+                for stop in range(start + 1, n + 1)
+                if parts[stop] == parts[start] - 1 and is_valid(start, stop)
+            )
+            words.append("".join(chunks[start:stop]))
+            start = stop
+        return " ".join(words)
 
     def normalized_word(self, word):
         """اشکال مختلف نرمالایزشدهٔ کلمه را برمی‌گرداند.
         
+        نتیجهٔ هر کلمه نگه داشته می‌شود تا تکرارهای بعدی آن دوباره تحلیل نشوند.
+        
         Examples:
             >>> normalizer = InformalNormalizer()
             >>> normalizer.normalized_word('می‌رم')
@@ -160,258 +419,185 @@ class InformalNormalizer(Normalizer):
         
         """
 
-        def analyzeWord(word):
-            endWordsList = [
-                "هاست",
-                "هایی",
-                "هایم",
-                "ترین",
-                "ایی",
-                "انی",
-                "شان",
-                "شون",
-                "است",
-                "تان",
-                "تون",
-                "مان",
-                "مون",
-                "هام",
-                "هاش",
-                "های",
-                "طور",
-                "ها",
-                "تر",
-                "ئی",
-                "یی",
-                "یم",
-                "ام",
-                "ای",
-                "ان",
-                "هم",
-                "رو",
-                "یت",
-                "ه",
-                "ی",
-                "ش",
-                "و",
-                "ا",
-                "ت",
-                "م",
-            ]
-
-            returnList = []
-
-            collectionOfWordAndSuffix = []
-
-            FoundEarly = False
-
-            midWordCondidate = []
-
-            if word.endswith("‌") or word.endswith("‎"):
-                word = word[:-1]
-
-            if word in self.lemmatizer.words or word in self.iword_map:
-                if word in self.lemmatizer.words:
-                    collectionOfWordAndSuffix.append({"word": word, "suffix": []})
-                if word in self.iword_map:
-                    collectionOfWordAndSuffix.append(
-                        {"word": self.iword_map[word], "suffix": []}
-                    )
-                FoundEarly = True
-
-            if not FoundEarly:
-                for endWord in endWordsList:
-                    if word.endswith(endWord):
-                        sliceWord = word[: -1 * len(endWord)]
-                        if (
-                            sliceWord in self.lemmatizer.words
-                            or sliceWord in self.iword_map
-                        ):
-                            if sliceWord in self.lemmatizer.words:
-                                collectionOfWordAndSuffix.append(
-                                    {"word": sliceWord, "suffix": [endWord]}
-                                )
-                            if sliceWord in self.iword_map:
-                                collectionOfWordAndSuffix.append(
-                                    {
-                                        "word": self.iword_map[sliceWord],
-                                        "suffix": [endWord],
-                                    }
-                                )
-                        else:
-                            midWordCondidate.append(sliceWord)
-                            midWordCondidate.append([endWord])
-
-                for endWord in endWordsList:
-                    for i in range(len(midWordCondidate) - 1):
-                        if i % 2 == 1:
-                            continue
-                        midWord = midWordCondidate[i]
-                        midWordEndWordList = midWordCondidate[i + 1]
-                        if midWord.endswith(endWord):
-                            sliceWord = midWord[: -1 * len(endWord)]
-                            if (
-                                sliceWord in self.lemmatizer.words
-                                or sliceWord in self.iword_map
-                            ):
-                                if sliceWord in self.lemmatizer.words:
-                                    collectionOfWordAndSuffix.append(
-                                        {
-                                            "word": sliceWord,
-                                            "suffix": [endWord] + midWordEndWordList,
-                                        }
-                                    )
-                                if sliceWord in self.iword_map:
-                                    collectionOfWordAndSuffix.append(
-                                        {
-                                            "word": self.iword_map[sliceWord],
-                                            "suffix": [endWord] + midWordEndWordList,
-                                        }
-                                    )
-
-            for i in range(len(collectionOfWordAndSuffix)):
-                newPossibelWordList = appendSuffixToWord(collectionOfWordAndSuffix[i])
-                for j in range(len(newPossibelWordList)):
-                    newPossibelWord = newPossibelWordList[j]
-                    if newPossibelWord not in returnList:
-                        returnList.append(newPossibelWord)
-
-            return returnList
-
-        def analyzeVerbWord(word):
-            if word in self.pastVerbs:
-                word = self.pastVerbs[word]
-                return [word]
+        if word in self._normalized_words:
+            return list(self._normalized_words[word])
 
-            if word in self.iword_map:
-                return []
+        possibleWords = self._normalized_word(word)
+        if len(self._normalized_words) >= self._normalized_words_limit:
+            self._normalized_words.clear()
+        self._normalized_words[word] = tuple(possibleWords)
+        return possibleWords
+
+    def _normalized_word(self, word):
+        straightForwardWords = self._straight_forward_words.get(word, [])
+        if len(straightForwardWords) > 0:
+            return list(straightForwardWords)
+
+        verbWordsList = self._analyze_verb_word(word)
+        if len(verbWordsList) > 0:
+            return verbWordsList
+        possibleWords = self._analyze_word(word)
+
+        mainWord = word
+        if mainWord in possibleWords:
+            possibleWords.remove(mainWord)
+            possibleWords.append(mainWord)
+        else:
+            if len(possibleWords) == 0:
+                possibleWords.append(mainWord)
+
+        return possibleWords
 
+    def _endings(self, word, endings):
+        # the suffixes of the word found in endings, in the order of their ranks
+        found = [
+            word[-size:]
+            for size in range(1, min(len(word), self._max_ending) + 1)
+            if word[-size:] in endings
+        ]
+        return sorted(found, key=endings.get)
+
+    def _analyze_word(self, word):
+        returnList = []
+
+        collectionOfWordAndSuffix = []
+
+        FoundEarly = False
+
+        midWordCondidate = []
+
+        if word.endswith("‌") or word.endswith("‎"):
+            word = word[:-1]
+
+        if word in self.lemmatizer.words or word in self.iword_map:
             if word in self.lemmatizer.words:
-                if word[-1] == "ن":
-                    None
-                else:
-                    return []
-
-            returnList = []
-
-            collectionOfVerbList = []
-
-            endVerbList = [
-                "یم",
-                "دم",
-                "دیم",
-                "ید",
-                "دی",
-                "دید",
-                "ند",
-                "دن",
-                "دند",
-                "ین",
-                "دین",
-                "ست",
-                "ستم",
-                "ستی",
-                "ستیم",
-                "ستید",
-                "ستند",
-                "ستن",
-                "م",
-                "ی",
-                "ه",
-                "د",
-                "ن",
-            ]
-
-            for endVerb in endVerbList:
-                if word.endswith(endVerb):
-                    if endVerb == "ین":
-                        collectionOfVerbList.append({"word": word[:-2], "suffix": "ید"})
-                    elif endVerb == "ستن":
-                        collectionOfVerbList.append(
-                            {"word": word[:-3], "suffix": "ستند"}
+                collectionOfWordAndSuffix.append({"word": word, "suffix": []})
+            if word in self.iword_map:
+                collectionOfWordAndSuffix.append(
+                    {"word": self.iword_map[word], "suffix": []}
+                )
+            FoundEarly = True
+
+        if not FoundEarly:
+            for endWord in self._endings(word, self._end_words):
+                sliceWord = word[: -1 * len(endWord)]
+                if sliceWord in self.lemmatizer.words or sliceWord in self.iword_map:
+                    if sliceWord in self.lemmatizer.words:
+                        collectionOfWordAndSuffix.append(
+                            {"word": sliceWord, "suffix": [endWord]}
+                        )
+                    if sliceWord in self.iword_map:
+                        collectionOfWordAndSuffix.append(
+                            {
+                                "word": self.iword_map[sliceWord],
+                                "suffix": [endWord],
+                            }
                         )
-                    elif endVerb == "ن":
-                        collectionOfVerbList.append({"word": word[:-1], "suffix": "ن"})
-                        collectionOfVerbList.append({"word": word[:-1], "suffix": "ند"})
-                    elif endVerb == "ه":
-                        if len(word) > 1:
-                            if word[-2] != "د":
-                                collectionOfVerbList.append(
-                                    {"word": word[:-1], "suffix": "د"}
-                                )
-                            collectionOfVerbList.append(
-                                {"word": word[:-1], "suffix": "ه"}
-                            )
-                        else:
-                            collectionOfVerbList.append(
-                                {"word": word[:-1], "suffix": "ه"}
-                            )
-                    else:
-                        collectionOfVerbList.append(
+                else:
+                    midWordCondidate.append((sliceWord, [endWord]))
+
+            # the suffixes of all the candidates in the order of the list
+            midWordEndings = sorted(
+                (self._end_words[endWord], i, endWord)
+                for i, (midWord, midWordEndWordList) in enumerate(midWordCondidate)
+                for endWord in self._endings(midWord, self._end_words)
+            )
+            for rank, i, endWord in midWordEndings:
+                midWord, midWordEndWordList = midWordCondidate[i]
+                sliceWord = midWord[: -1 * len(endWord)]
+                if sliceWord in self.lemmatizer.words or sliceWord in self.iword_map:
+                    if sliceWord in self.lemmatizer.words:
+                        collectionOfWordAndSuffix.append(
                             {
-                                "word": word[: -1 * len(endVerb)],
-                                "suffix": endVerb,
+                                "word": sliceWord,
+                                "suffix": [endWord] + midWordEndWordList,
                             }
                         )
-            collectionOfVerbList.append({"word": word, "suffix": ""})
-            collectionOfVerbList2 = []
-            for i in range(len(collectionOfVerbList)):
-                mainWord = collectionOfVerbList[i]["word"]
-                collectionOfVerbList[i]["preffix"] = ""
-                if mainWord.startswith("بر"):
-                    modifiedWord = mainWord[2:]
-                    newMainWord = ""
-                    if modifiedWord.startswith("نمی"):
-                        collectionOfVerbList[i]["preffix"] = "برنمی"
-                        newMainWord = modifiedWord[3:]
-                    elif modifiedWord.startswith("می"):
-                        collectionOfVerbList[i]["preffix"] = "برمی"
-                        newMainWord = modifiedWord[2:]
-                    elif modifiedWord.startswith("ن"):
-                        collectionOfVerbList[i]["preffix"] = "برن"
-                        newMainWord = modifiedWord[1:]
-                    elif modifiedWord.startswith("بی"):
-                        collectionOfVerbList[i]["preffix"] = "بربی"
-                        newMainWord = modifiedWord[2:]
-                    elif modifiedWord.startswith("ب"):
-                        collectionOfVerbList[i]["preffix"] = "برب"
-                        newMainWord = modifiedWord[1:]
-                    else:
-                        collectionOfVerbList[i]["preffix"] = "بر"
-                        newMainWord = modifiedWord
-                        collectionOfVerbList2.append(
+                    if sliceWord in self.iword_map:
+                        collectionOfWordAndSuffix.append(
                             {
-                                "word": mainWord,
-                                "preffix": "",
-                                "suffix": collectionOfVerbList[i]["suffix"],
+                                "word": self.iword_map[sliceWord],
+                                "suffix": [endWord] + midWordEndWordList,
                             }
                         )
 
-                    if newMainWord != "":
-                        collectionOfVerbList[i]["word"] = newMainWord
-                elif mainWord.startswith("نمی"):
-                    collectionOfVerbList[i]["preffix"] = "نمی"
-                    collectionOfVerbList[i]["word"] = mainWord[3:]
-                elif mainWord.startswith("می"):
-                    collectionOfVerbList[i]["preffix"] = "می"
-                    collectionOfVerbList[i]["word"] = mainWord[2:]
-                elif mainWord.startswith("ن"):
-                    collectionOfVerbList[i]["preffix"] = "ن"
-                    collectionOfVerbList[i]["word"] = mainWord[1:]
-                    collectionOfVerbList2.append(
-                        {
-                            "word": mainWord,
-                            "preffix": "",
-                            "suffix": collectionOfVerbList[i]["suffix"],
-                        }
-                    )
+        for i in range(len(collectionOfWordAndSuffix)):
+            newPossibelWordList = self._append_suffix_to_word(
+                collectionOfWordAndSuffix[i]
+            )
+            for j in range(len(newPossibelWordList)):
+                newPossibelWord = newPossibelWordList[j]
+                if newPossibelWord not in returnList:
+                    returnList.append(newPossibelWord)
+
+        return returnList
+
+    def _analyze_verb_word(self, word):
+        if word in self.pastVerbs:
+            word = self.pastVerbs[word]
+            return [word]
+
+        if word in self.iword_map:
+            return []
 
-                elif mainWord.startswith("بی"):
-                    collectionOfVerbList[i]["preffix"] = "بی"
-                    collectionOfVerbList[i]["word"] = mainWord[2:]
-                elif mainWord.startswith("ب"):
-                    collectionOfVerbList[i]["preffix"] = "ب"
-                    collectionOfVerbList[i]["word"] = mainWord[1:]
+        if word in self.lemmatizer.words:
+            if word[-1] == "ن":
+                None
+            else:
+                return []
+
+        returnList = []
+
+        collectionOfVerbList = []
+
+        for endVerb in self._endings(word, self._end_verbs):
+            if endVerb == "ین":
+                collectionOfVerbList.append({"word": word[:-2], "suffix": "ید"})
+            elif endVerb == "ستن":
+                collectionOfVerbList.append({"word": word[:-3], "suffix": "ستند"})
+            elif endVerb == "ن":
+                collectionOfVerbList.append({"word": word[:-1], "suffix": "ن"})
+                collectionOfVerbList.append({"word": word[:-1], "suffix": "ند"})
+            elif endVerb == "ه":
+                if len(word) > 1:
+                    if word[-2] != "د":
+                        collectionOfVerbList.append({"word": word[:-1], "suffix": "د"})
+                    collectionOfVerbList.append({"word": word[:-1], "suffix": "ه"})
+                else:
+                    collectionOfVerbList.append({"word": word[:-1], "suffix": "ه"})
+            else:
+                collectionOfVerbList.append(
+                    {
+                        "word": word[: -1 * len(endVerb)],
+                        "suffix": endVerb,
+                    }
+                )
+        collectionOfVerbList.append({"word": word, "suffix": ""})
+        collectionOfVerbList2 = []
+        for i in range(len(collectionOfVerbList)):
+            mainWord = collectionOfVerbList[i]["word"]
+            collectionOfVerbList[i]["preffix"] = ""
+            if mainWord.startswith("بر"):
+                modifiedWord = mainWord[2:]
+                newMainWord = ""
+                if modifiedWord.startswith("نمی"):
+                    collectionOfVerbList[i]["preffix"] = "برنمی"
+                    newMainWord = modifiedWord[3:]
+                elif modifiedWord.startswith("می"):
+                    collectionOfVerbList[i]["preffix"] = "برمی"
+                    newMainWord = modifiedWord[2:]
+                elif modifiedWord.startswith("ن"):
+                    collectionOfVerbList[i]["preffix"] = "برن"
+                    newMainWord = modifiedWord[1:]
+                elif modifiedWord.startswith("بی"):
+                    collectionOfVerbList[i]["preffix"] = "بربی"
+                    newMainWord = modifiedWord[2:]
+                elif modifiedWord.startswith("ب"):
+                    collectionOfVerbList[i]["preffix"] = "برب"
+                    newMainWord = modifiedWord[1:]
+                else:
+                    collectionOfVerbList[i]["preffix"] = "بر"
+                    newMainWord = modifiedWord
                     collectionOfVerbList2.append(
                         {
                             "word": mainWord,
@@ -420,313 +606,147 @@ class InformalNormalizer(Normalizer):
                         }
                     )
 
-            for i in range(len(collectionOfVerbList2)):
-                collectionOfVerbList.append(collectionOfVerbList2[i])
-
-            collectionOfRealVerbList = []
-            for i in range(len(collectionOfVerbList)):
-                mainWord = collectionOfVerbList[i]["word"]
-                if mainWord.startswith("‌") or mainWord.startswith("‎"):
-                    mainWord = mainWord[1:]
-
-                mainWord2 = None
-                if mainWord.startswith("ا"):
-                    mainWord2 = "آ" + mainWord[1:]
-                if mainWord in self.pastVerbs:
-                    collectionOfVerbList[i]["word"] = self.pastVerbs[mainWord]
+                if newMainWord != "":
+                    collectionOfVerbList[i]["word"] = newMainWord
+            elif mainWord.startswith("نمی"):
+                collectionOfVerbList[i]["preffix"] = "نمی"
+                collectionOfVerbList[i]["word"] = mainWord[3:]
+            elif mainWord.startswith("می"):
+                collectionOfVerbList[i]["preffix"] = "می"
+                collectionOfVerbList[i]["word"] = mainWord[2:]
+            elif mainWord.startswith("ن"):
+                collectionOfVerbList[i]["preffix"] = "ن"
+                collectionOfVerbList[i]["word"] = mainWord[1:]
+                collectionOfVerbList2.append(
+                    {
+                        "word": mainWord,
+                        "preffix": "",
+                        "suffix": collectionOfVerbList[i]["suffix"],
+                    }
+                )
+
+            elif mainWord.startswith("بی"):
+                collectionOfVerbList[i]["preffix"] = "بی"
+                collectionOfVerbList[i]["word"] = mainWord[2:]
+            elif mainWord.startswith("ب"):
+                collectionOfVerbList[i]["preffix"] = "ب"
+                collectionOfVerbList[i]["word"] = mainWord[1:]
+                collectionOfVerbList2.append(
+                    {
+                        "word": mainWord,
+                        "preffix": "",
+                        "suffix": collectionOfVerbList[i]["suffix"],
+                    }
+                )
+
+        for i in range(len(collectionOfVerbList2)):
+            collectionOfVerbList.append(collectionOfVerbList2[i])
+
+        collectionOfRealVerbList = []
+        for i in range(len(collectionOfVerbList)):
+            mainWord = collectionOfVerbList[i]["word"]
+            if mainWord.startswith("‌") or mainWord.startswith("‎"):
+                mainWord = mainWord[1:]
+
+            mainWord2 = None
+            if mainWord.startswith("ا"):
+                mainWord2 = "آ" + mainWord[1:]
+            if mainWord in self.pastVerbs:
+                collectionOfVerbList[i]["word"] = self.pastVerbs[mainWord]
+                collectionOfRealVerbList.append(collectionOfVerbList[i])
+            if mainWord in self.presentVerbs:
+                collectionOfVerbList[i]["word"] = self.presentVerbs[mainWord]
+                collectionOfRealVerbList.append(collectionOfVerbList[i])
+            if mainWord2 != None and not (
+                collectionOfVerbList[i]["preffix"] == "بربی"
+                or collectionOfVerbList[i]["preffix"] == "بی"
+            ):
+                if mainWord2 in self.pastVerbs:
+                    collectionOfVerbList[i]["word"] = self.pastVerbs[mainWord2]
                     collectionOfRealVerbList.append(collectionOfVerbList[i])
-                if mainWord in self.presentVerbs:
-                    collectionOfVerbList[i]["word"] = self.presentVerbs[mainWord]
+                if mainWord2 in self.presentVerbs:
+                    collectionOfVerbList[i]["word"] = self.presentVerbs[mainWord2]
                     collectionOfRealVerbList.append(collectionOfVerbList[i])
-                if mainWord2 != None and not (
-                    collectionOfVerbList[i]["preffix"] == "بربی"
-                    or collectionOfVerbList[i]["preffix"] == "بی"
-                ):
-                    if mainWord2 in self.pastVerbs:
-                        collectionOfVerbList[i]["word"] = self.pastVerbs[mainWord2]
-                        collectionOfRealVerbList.append(collectionOfVerbList[i])
-                    if mainWord2 in self.presentVerbs:
-                        collectionOfVerbList[i]["word"] = self.presentVerbs[mainWord2]
-                        collectionOfRealVerbList.append(collectionOfVerbList[i])
-
-            for i in range(len(collectionOfRealVerbList)):
-                preffix = collectionOfRealVerbList[i]["preffix"]
-                suffix = collectionOfRealVerbList[i]["suffix"]
-                mainWord = collectionOfRealVerbList[i]["word"]
-                returnWord = preffix
-                if preffix.endswith("می"):
-                    returnWord += "‌"
-                returnWord += mainWord
-                returnWord += suffix
-                if mainWord != "":
-                    if returnWord not in returnList:
-                        returnList.append(returnWord)
-
-            return returnList
-
-        def appendSuffixToWord(OneCollectionOfWordAndSuffix):
-            mainWord = OneCollectionOfWordAndSuffix["word"]
-            suffixList = OneCollectionOfWordAndSuffix["suffix"]
-            adhesiveAlphabet = {
-                "ب": "ب",
-                "پ": "پ",
-                "ت": "ت",
-                "ث": "ث",
-                "ج": "ج",
-                "چ": "چ",
-                "ح": "ح",
-                "خ": "خ",
-                "س": "س",
-                "ش": "ش",
-                "ص": "ص",
-                "ض": "ض",
-                "ع": "ع",
-                "غ": "غ",
-                "ف": "ف",
-                "ق": "ق",
-                "ک": "ک",
-                "گ": "گ",
-                "ل": "ل",
-                "م": "م",
-                "ن": "ن",
-                "ه": "ه",
-                "ی": "ی",
-            }
-            returnList = []
-            returnWord = mainWord
-            returnWord2 = None
-            returnWord3 = None
-            if len(suffixList) == 0:
-                return [returnWord]
-            if len(suffixList) > 1:
-                if suffixList[0] == "ه" and suffixList[1] == "ا":
-                    suffixList[0] = "ها"
-                    suffixList.remove(suffixList[1])
-                if suffixList[0] == "ه" and suffixList[1] == "است":
-                    suffixList[0] = "هاست"
-                    suffixList.remove(suffixList[1])
-                if suffixList[0] == "ت" and suffixList[1] == "ا":
-                    suffixList[0] = "تا"
-                    suffixList.remove(suffixList[1])
-            for i in range(len(suffixList)):
-                if suffixList[i] == "شون":
-                    returnWord += "شان"
-                elif suffixList[i] == "تون":
-                    returnWord += "تان"
-                elif suffixList[i] == "مون":
-                    returnWord += "مان"
-                elif suffixList[i] == "هام":
-                    try:
-                        var = adhesiveAlphabet[returnWord[-1]]
-                        returnWord += "‌"
-                    except:
-                        None
-                    returnWord += "هایم"
-                elif suffixList[i] == "ها":
-                    try:
-                        var = adhesiveAlphabet[returnWord[-1]]
-                        returnWord += "‌"
-                    except:
-                        None
-                    returnWord += "ها"
-                elif (
-                    suffixList[i] == "ا"
-                    and suffixList[len(suffixList) - 1] == "ا"
-                    and not returnWord.endswith("ه")
-                ):
-                    try:
-                        var = adhesiveAlphabet[returnWord[-1]]
-                        returnWord += "‌"
-                    except:
-                        None
-                    returnWord += "ها"
-                elif suffixList[i] == "و" and suffixList[len(suffixList) - 1] == "و":
-                    returnWord2 = returnWord
-                    returnWord2 += " و"
-                    returnWord += " را"
-
-                elif suffixList[i] == "رو" and suffixList[len(suffixList) - 1] == "رو":
-                    returnWord += " را"
-
-                elif suffixList[i] == "ه" and suffixList[len(suffixList) - 1] == "ه":
-                    returnWord2 = returnWord
-                    returnWord2 += "ه"
-                    returnWord3 = returnWord
-                    returnWord3 += " است"
-                    returnWord += "ه است"
-                else:
-                    returnWord += suffixList[i]
-            returnList.append(returnWord)
-            if returnWord2 != None:
-                returnList.append(returnWord2)
-            if returnWord3 != None:
-                returnList.append(returnWord3)
-            return returnList
-
-        def straightForwardResult(word):
-            straightForwardDic = {
-                "ب": ["به"],
-                "ک": ["که"],
-                "آن": ["آن"],
-                "می‌آید": ["می‌آید"],
-                "میاید": ["می‌آید"],
-                "می‌آیم": ["می‌آیم"],
-                "میایم": ["می‌آیم"],
-                "نمی‌آید": ["نمی‌آید"],
-                "نمیاید": ["نمی‌آید"],
-                "نمی‌آیم": ["نمی‌آیم"],
-                "نمیایم": ["نمی‌آیم"],
-                "برمی‌آید": ["برمی‌آید"],
-                "برمیاید": ["برمی‌آید"],
-                "برمی‌آیم": ["برمی‌آیم"],
-                "برمیایم": ["برمی‌آیم"],
-                "برنمی‌آید": ["برنمی‌آید"],
-                "برنمیاید": ["برنمی‌آید"],
-                "برنمی‌آیم": ["برنمی‌آیم"],
-                "برنمیایم": ["برنمی‌آیم"],
-                "منظوره": ["منظوره"],
-                "بدن": ["بدن"],
-                "میا": ["میا"],
-                "نیس": ["نیست"],
-                "فک": ["فکر"],
-                "برام": ["برایم"],
-                "آ": ["آ"],
-                "آی": ["آی"],
-                "این": ["این"],
-                "است": ["است"],
-                "ان": ["ان"],
-                "اند": ["اند"],
-                "میان": ["میان"],
-                "گردن": ["گردن"],
-                "اینهمه": ["اینهمه"],
-                "آنهمه": ["آنهمه"],
-                "الیه": ["الیه"],
-                "غرغره": ["غرغره"],
-                "لیله": ["لیله"],
-                "بزرگانه": ["بزرگانه"],
-                "پرستانه": ["پرستانه"],
-                "ام": ["ام"],
-                "بادی": ["بادی"],
-                "نان": ["نان"],
-                "باورم": ["باورم"],
-                "اوه": ["اوه"],
-                "چقد": ["چقدر"],
-                "چو": ["چون"],
-                "هس": ["هست"],
-                "اومدند": ["آمدند"],
-                "ش": ["اش"],
-                "بش": ["بهش"],
-                "ازت": ["از تو"],
-                "رو": ["را", "رو"],
-                "پایتون": ["پایتون"],
-                "اردن": ["اردن"],
-                "دست": ["دست"],
-                "دستی": ["دستی"],
-                "دستم": ["دستم"],
-                "دین": ["دین"],
-                "شین": ["شین"],
-                "سراتو": ["سراتو"],
-                "فالو": ["فالو"],
-                "هرجا": ["هرجا"],
-                "میدان": ["میدان"],
-                "میدون": ["میدان"],
-                "کفا": ["کفا"],
-                "ویا": ["و یا"],
-                "نشد": ["نشد"],
-                "شو": ["شو"],
-                "مشیا": ["مشیا"],
-                "پلاسما": ["پلاسما"],
-                "فیلیمو": ["فیلیمو"],
-                "پاشو": ["پاشو"],
-                "میر": ["میر"],
-                "بارم": ["بار هم", "بارم"],
-                "برند": ["برند"],
-                "کنه": ["کند"],
-                "بتونه": ["بتواند"],
-                "باشه": ["باشد"],
-                "بخوان": ["بخوان"],
-                "بدم": ["بدم"],
-                "برم": ["برم"],
-                "بده": ["بده"],
-                "نده": ["نده"],
-                "شهرو": ["شهرو"],
-                "شیرو": ["شیرو"],
-                "نگذاشته": ["نگذاشته"],
-                "نگرفته": ["نگرفته"],
-                "نمیشناخته": ["نمی‌شناخته"],
-                "نمی‌شناخته": ["نمی‌شناخته"],
-                "بشین": ["بشین"],
-                "هارو": ["ها را"],
-                "مارو": ["ما را"],
-                "میاومد": ["می‌آمد"],
-                "می‌اومد": ["می‌آمد"],
-                "میخواسته": ["می‌خواسته"],
-                "می‌خواسته": ["می‌خواسته"],
-                "نمیخواسته": ["نمی‌خواسته"],
-                "نمی‌خواسته": ["نمی‌خواسته"],
-                "میتوانسته": ["می‌توانسته"],
-                "می‌توانسته": ["می‌توانسته"],
-                "میرفته": ["می‌رفته"],
-                "می‌رفته": ["می‌رفته"],
-                "نشین": ["نشین"],
-                "انا": ["انا"],
-                "خونی": ["خونی"],
-                "خون": ["خون"],
-                "یالا": ["یالا"],
-                "میخواند": ["می‌خواند"],
-                "می‌خواند": ["می‌خواند"],
-                "نمیخواند": ["نمی‌خواند"],
-                "نمی‌خواند": ["نمی‌خواند"],
-                "میده": ["می‌دهد"],
-                "می‌ده": ["می‌دهد"],
-                "میشه": ["می‌شود"],
-                "می‌شه": ["می‌شود"],
-                "میشد": ["می‌شد"],
-                "می‌شد": ["می‌شد"],
-                "میشدم": ["می‌شدم"],
-                "می‌شدم": ["می‌شدم"],
-                "نمیشد": ["نمی‌شد"],
-                "نمی‌شد": ["نمی‌شد"],
-                "بردم": ["بردم"],
-                "بره": ["بره", "برود"],
-                "شم": ["بشوم"],
-                "اوست": ["اوست"],
-                "بیا": ["بیا"],
-                "نیا": ["نیا"],
-                "میاد": ["می‌آید"],
-                "نشدی": ["نشدی"],
-                "بخواند": ["بخواند"],
-                "سیا": ["سیا"],
-                "میدید": ["می‌دید"],
-                "می‌دید": ["می‌دید"],
-                "وا": ["وا"],
-                "برگشته": ["برگشته"],
-                "میخواست": ["می‌خواست"],
-                "می‌خواست": ["می‌خواست"],
-            }
-            try:
-                return straightForwardDic[word]
-            except:
-                return []
-
-        straightForwardWords = straightForwardResult(word)
-        if len(straightForwardWords) > 0:
-            return straightForwardWords
-
-        verbWordsList = analyzeVerbWord(word)
-        if len(verbWordsList) > 0:
-            return verbWordsList
-        possibleWords = analyzeWord(word)
 
-        mainWord = word
-        if mainWord in possibleWords:
-            possibleWords.remove(mainWord)
-            possibleWords.append(mainWord)
-        else:
-            if len(possibleWords) == 0:
-                possibleWords.append(mainWord)
-
-        return possibleWords
+        for i in range(len(collectionOfRealVerbList)):
+            preffix = collectionOfRealVerbList[i]["preffix"]
+            suffix = collectionOfRealVerbList[i]["suffix"]
+            mainWord = collectionOfRealVerbList[i]["word"]
+            returnWord = preffix
+            if preffix.endswith("می"):
+                returnWord += "‌"
+            returnWord += mainWord
+            returnWord += suffix
+            if mainWord != "":
+                if returnWord not in returnList:
+                    returnList.append(returnWord)
+
+        return returnList
+
+    def _append_suffix_to_word(self, OneCollectionOfWordAndSuffix):
+        mainWord = OneCollectionOfWordAndSuffix["word"]
+        suffixList = OneCollectionOfWordAndSuffix["suffix"]
+        returnList = []
+        returnWord = mainWord
+        returnWord2 = None
+        returnWord3 = None
+        if len(suffixList) == 0:
+            return [returnWord]
+        if len(suffixList) > 1:
+            if suffixList[0] == "ه" and suffixList[1] == "ا":
+                suffixList[0] = "ها"
+                suffixList.remove(suffixList[1])
+            if suffixList[0] == "ه" and suffixList[1] == "است":
+                suffixList[0] = "هاست"
+                suffixList.remove(suffixList[1])
+            if suffixList[0] == "ت" and suffixList[1] == "ا":
+                suffixList[0] = "تا"
+                suffixList.remove(suffixList[1])
+        for i in range(len(suffixList)):
+            if suffixList[i] == "شون":
+                returnWord += "شان"
+            elif suffixList[i] == "تون":
+                returnWord += "تان"
+            elif suffixList[i] == "مون":
+                returnWord += "مان"
+            elif suffixList[i] == "هام":
+                if returnWord[-1:] in self._joining_letters:
+                    returnWord += "‌"
+                returnWord += "هایم"
+            elif suffixList[i] == "ها":
+                if returnWord[-1:] in self._joining_letters:
+                    returnWord += "‌"
+                returnWord += "ها"
+            elif (
+                suffixList[i] == "ا"
+                and suffixList[len(suffixList) - 1] == "ا"
+                and not returnWord.endswith("ه")
+            ):
+                if returnWord[-1:] in self._joining_letters:
+                    returnWord += "‌"
+                returnWord += "ها"
+            elif suffixList[i] == "و" and suffixList[len(suffixList) - 1] == "و":
+                returnWord2 = returnWord
+                returnWord2 += " و"
+                returnWord += " را"
+
+            elif suffixList[i] == "رو" and suffixList[len(suffixList) - 1] == "رو":
+                returnWord += " را"
+
+            elif suffixList[i] == "ه" and suffixList[len(suffixList) - 1] == "ه":
+                returnWord2 = returnWord
+                returnWord2 += "ه"
+                returnWord3 = returnWord
+                returnWord3 += " است"
+                returnWord += "ه است"
+            else:
+                returnWord += suffixList[i]
+        returnList.append(returnWord)
+        if returnWord2 != None:
+            returnList.append(returnWord2)
+        if returnWord3 != None:
+            returnList.append(returnWord3)
+        return returnList
 
     def normalize(self, text):
         """متن محاوره‌ای را به متن فارسی معیار تبدیل می‌کند.
@@ -800,6 +820,8 @@ class InformalLemmatizer(Lemmatizer):
 
         self.words.update(temp)
 
+        # the verbs map is shared with other lemmatizers, extend a copy of it
+        self.verbs = dict(self.verbs)
         temp = {}
         for verb in self.verbs:
             if verb.endswith("د"):
@@ -807,12 +829,12 @@ class InformalLemmatizer(Lemmatizer):
 
         self.verbs.update(temp)
 
-        with codecs.open(informal_verbs, encoding="utf8") as vf:
-            for f, i, flag in map(lambda x: x.strip().split(" ", 2), vf):
-                self.verbs.update(dict(map(lambda x: (x, f), self.iconjugations(i))))
+        for f, i, flag in map(lambda x: x.split(" ", 2), read_lines(informal_verbs)):
+            self.verbs.update(dict(map(lambda x: (x, f), self.iconjugations(i))))
 
-        with codecs.open(informal_words, encoding="utf8") as wf:
-            self.words.update(map(lambda x: x.strip().split(" ", 1)[0], wf))
+        self.words.update(
+            map(lambda x: x.split(" ", 1)[0], read_lines(informal_words))
+        )
 
     def iconjugations(self, verb):
         ends = ["م", "ی", "", "یم", "ین", "ن"]
@@ -13,7 +13,8 @@
 """
 
 from __future__ import unicode_literals
-from .utils import default_words, default_verbs
+from functools import lru_cache
+from .utils import default_words, default_verbs, shared_lexicon
 from .Stemmer import Stemmer
 from .WordTokenizer import WordTokenizer
 
@@ -31,31 +32,106 @@ class Lemmatizer(object):
             این حال شما می‌توانید فایل موردنظر خود را معرفی کنید. برای آگاهی از
             ساختار این فایل به فایل پیش‌فرض مراجعه کنید.
         joined_verb_parts (bool, optional): اگر `True` باشد افعال چندبخشی را با کاراکتر زیرخط به هم می‌چسباند.
+        cache_size (int, optional): تعداد جفت‌های `(کلمه، نوع)` که ریشهٔ آن‌ها
+            نگه داشته می‌شود. وقتی حافظه پر شود ریشهٔ جفتی که دیرتر از همه
+            استفاده شده کنار گذاشته می‌شود. اگر `None` باشد محدودیتی ندارد و
+            اگر `0` باشد چیزی نگه داشته نمی‌شود.
     
     """
 
     def __init__(
-        self, words_file=default_words, verbs_file=default_verbs, joined_verb_parts=True
+        self,
+        words_file=default_words,
+        verbs_file=default_verbs,
+        joined_verb_parts=True,
+        cache_size=10000,
     ):
-        self.verbs = {}
         self.stemmer = Stemmer()
+        self.verbs_file = verbs_file
+        self.joined_verb_parts = joined_verb_parts
+        self.cache_size = cache_size
 
         tokenizer = WordTokenizer(words_file=default_words, verbs_file=verbs_file)
         self.words = tokenizer.words
+        self._verbs = None if verbs_file else {}
+        self._cached_lemmatize = lru_cache(maxsize=cache_size)(self._lemmatize)
 
-        if verbs_file:
-            self.verbs["است"] = "#است"
+    def __getstate__(self):
+        # the cache wraps a bound method, each copy starts with an empty one
+        state = self.__dict__.copy()
+        del state["_cached_lemmatize"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cached_lemmatize = lru_cache(maxsize=self.cache_size)(self._lemmatize)
+
+    @property
+    def verbs(self):
+        """اشکال صرفی افعال و ریشهٔ آن‌ها.
+        
+        این جدول شامل حدود صدهزار صورت صرفی است و ساختنش بخش عمدهٔ زمان
+        راه‌اندازی لماتایزر را می‌گیرد؛ بنابراین در اولین استفاده ساخته می‌شود و
+        بین همهٔ نمونه‌هایی که فایل افعال یکسانی دارند مشترک است.
+        
+        """
+        if self._verbs is None:
+            self._verbs = shared_lexicon(
+                ("lemmatizer", type(self).conjugations, self.joined_verb_parts),
+                [self.verbs_file],
+                self.load_verbs,
+            )
+        return self._verbs
+
+    @verbs.setter
+    def verbs(self, verbs):
+        self._verbs = verbs
+        self.cache_clear()
+
+    def cache_info(self):
+        """آمار حافظهٔ ریشه‌ها را برمی‌گرداند.
+        
+        Examples:
+            >>> lemmatizer = Lemmatizer()
+            >>> lemmatizer.lemmatize_many(['کتاب‌ها', 'را', 'کتاب‌ها'])
+            ['کتاب', 'را', 'کتاب']
+            >>> lemmatizer.lemmatize('کتاب‌ها')
+            'کتاب'
+            >>> info = lemmatizer.cache_info()
+            >>> info.hits, info.misses, info.currsize
+            (1, 2, 2)
+        
+        Returns:
+            (CacheInfo): تعداد یافتن‌ها (`hits`) و نیافتن‌ها (`misses`) در
+                حافظه، حداکثر اندازه (`maxsize`) و اندازهٔ فعلی (`currsize`) آن.
+        
+        """
+        return self._cached_lemmatize.cache_info()
+
+    def cache_clear(self):
+        """حافظهٔ ریشه‌ها و آمار آن را پاک می‌کند.
+        
+        اگر `words` یا `verbs` پس از شروع ریشه‌یابی تغییر کنند باید این تابع
+        فراخوانی شود.
+        
+        """
+        self._cached_lemmatize.cache_clear()
+
+    def load_verbs(self):
+        tokenizer = WordTokenizer(verbs_file=self.verbs_file)
+        verbs = {"است": "#است"}
+        for verb in tokenizer.verbs:
+            for tense in self.conjugations(verb):
+                verbs[tense] = verb
+        if self.joined_verb_parts:
             for verb in tokenizer.verbs:
-                for tense in self.conjugations(verb):
-                    self.verbs[tense] = verb
-            if joined_verb_parts:
-                for verb in tokenizer.verbs:
-                    bon = verb.split("#")[0]
-                    for after_verb in tokenizer.after_verbs:
-                        self.verbs[bon + "ه_" + after_verb] = verb
-                        self.verbs["ن" + bon + "ه_" + after_verb] = verb
-                    for before_verb in tokenizer.before_verbs:
-                        self.verbs[before_verb + "_" + bon] = verb
+                bon = verb.split("#")[0]
+                for after_verb in tokenizer.after_verbs:
+                    verbs[bon + "ه_" + after_verb] = verb
+                    verbs["ن" + bon + "ه_" + after_verb] = verb
+                for before_verb in tokenizer.before_verbs:
+                    verbs[before_verb + "_" + bon] = verb
+        return verbs
 
     def lemmatize(self, word, pos=""):
         """ریشهٔ کلمه را پیدا می‌کند.
@@ -90,6 +166,31 @@ class Lemmatizer(object):
             (str): ریشهٔ کلمه
         
         """
+        return self._cached_lemmatize(word, pos)
+
+    def lemmatize_many(self, words, tags=None):
+        """ریشهٔ کلمات ورودی را پیدا می‌کند.
+        
+        هر جفت `(کلمه، نوع)` فقط یک بار ریشه‌یابی می‌شود.
+        
+        Examples:
+            >>> lemmatizer = Lemmatizer()
+            >>> lemmatizer.lemmatize_many(['کتاب‌ها', 'می‌روم', 'اجتماعی'], ['N', 'V', 'AJ'])
+            ['کتاب', 'رفت#رو', 'اجتماعی']
+        
+        Args:
+            words (List[str]): کلماتی که باید پردازش شوند.
+            tags (List[str], optional): نوع هر کلمه؛ اگر داده نشود نوع کلمات خالی در نظر گرفته می‌شود.
+        
+        Returns:
+            (List[str]): ریشهٔ هر کلمه به ترتیب ورودی.
+        
+        """
+        pairs = list(zip(words, tags)) if tags is not None else [(w, "") for w in words]
+        lemmas = {pair: self._cached_lemmatize(*pair) for pair in dict.fromkeys(pairs)}
+        return [lemmas[pair] for pair in pairs]
+
+    def _lemmatize(self, word, pos):
         if not pos and word in self.words:
             return word
 
@@ -6,9 +6,88 @@
 
 from __future__ import unicode_literals
 import re
+from multiprocessing import cpu_count
 from .Lemmatizer import Lemmatizer
 from .WordTokenizer import WordTokenizer
-from .utils import maketrans, regex_replace
+from .utils import (
+    default_words,
+    default_verbs,
+    maketrans,
+    merge_translations,
+    compile_patterns,
+    regex_replace,
+    imap_chunks,
+    shared_lexicon,
+)
+
+
+class SpacingLexicon(object):
+    """درخت پیشوندیِ کلمات و افعالی که از چند بخشِ جداشده با نیم‌فاصله ساخته
+    شده‌اند.
+    
+    هر یال این درخت یک بخش از کلمه است؛ برای نمونه «می‌روم» مسیر `می` ← `روم` را
+    می‌سازد. به این ترتیب برای تشخیص اینکه دو توکن با نیم‌فاصله به یک کلمهٔ
+    معتبر تبدیل می‌شوند یا نه، کافی است از گرهِ توکن اول یک گام با توکن دوم
+    پیش برویم و نیازی به ساختن رشتهٔ ترکیبی نیست.
+    
+    Args:
+        verbs (Iterable[str]): صورت‌های صرفی افعال.
+        words (Dict[str,Tuple[int,Tuple[str]]]): کلمات به همراه بسامد و برچسب‌ها؛ کلماتی که بسامد صفر دارند کنار گذاشته می‌شوند.
+    
+    """
+
+    verb, word = 1, 2
+
+    def __init__(self, verbs, words):
+        self.root = {}
+        for verb in verbs:
+            self.add(verb, self.verb)
+        for word, (count, tags) in words.items():
+            if count > 0:
+                self.add(word, self.word)
+
+    def add(self, entry, kind):
+        parts = entry.split("‌")
+        if len(parts) < 2:
+            return
+
+        node = self.root
+        for part in parts:
+            node = node.setdefault(part, {})
+        node[None] = node.get(None, 0) | kind
+
+    def walk(self, node, token):
+        """از گرهِ `node` با بخش‌های `token` پیش می‌رود و گرهِ مقصد یا `None` را
+        برمی‌گرداند.
+        
+        Examples:
+            >>> lexicon = SpacingLexicon(['می‌روم'], {})
+            >>> lexicon.kind(lexicon.walk(lexicon.walk(lexicon.root, 'می'), 'روم'))
+            1
+            >>> lexicon.walk(lexicon.root, 'کتاب') is None
+            True
+        
+        Args:
+            node (Dict): گرهِ شروع؛ برای شروع از ریشه `lexicon.root` را بدهید.
+            token (str): توکنی که باید مسیر آن طی شود.
+        
+        Returns:
+            (Dict): گرهِ مقصد.
+        
+        """
+        if node is None:
+            return None
+        if "‌" not in token:
+            return node.get(token)
+
+        for part in token.split("‌"):
+            node = node.get(part)
+            if node is None:
+                return None
+        return node
+
+    def kind(self, node):
+        return node.get(None, 0) if node else 0
 
 
 class Normalizer(object):
@@ -45,17 +124,40 @@ class Normalizer(object):
         self._persian_number = persian_numbers
         self._unicodes_replacement = unicodes_replacement
         self._seperate_mi = seperate_mi
+        self._options = dict(
+            correct_spacing=correct_spacing,
+            remove_diacritics=remove_diacritics,
+            remove_specials_chars=remove_specials_chars,
+            decrease_repeated_chars=decrease_repeated_chars,
+            persian_style=persian_style,
+            persian_numbers=persian_numbers,
+            unicodes_replacement=unicodes_replacement,
+            seperate_mi=seperate_mi,
+        )
 
         self.translation_src = "ؠػػؽؾؿكيٮٯٷٸٹٺٻټٽٿڀځٵٶٷٸٹٺٻټٽٿڀځڂڅڇڈډڊڋڌڍڎڏڐڑڒړڔڕږڗڙښڛڜڝڞڟڠڡڢڣڤڥڦڧڨڪګڬڭڮڰڱڲڳڴڵڶڷڸڹںڻڼڽھڿہۂۃۄۅۆۇۈۉۊۋۏۍێېۑےۓەۮۯۺۻۼۿݐݑݒݓݔݕݖݗݘݙݚݛݜݝݞݟݠݡݢݣݤݥݦݧݨݩݪݫݬݭݮݯݰݱݲݳݴݵݶݷݸݹݺݻݼݽݾݿࢠࢡࢢࢣࢤࢥࢦࢧࢨࢩࢪࢫࢮࢯࢰࢱࢬࢲࢳࢴࢶࢷࢸࢹࢺࢻࢼࢽﭐﭑﭒﭓﭔﭕﭖﭗﭘﭙﭚﭛﭜﭝﭞﭟﭠﭡﭢﭣﭤﭥﭦﭧﭨﭩﭮﭯﭰﭱﭲﭳﭴﭵﭶﭷﭸﭹﭺﭻﭼﭽﭾﭿﮀﮁﮂﮃﮄﮅﮆﮇﮈﮉﮊﮋﮌﮍﮎﮏﮐﮑﮒﮓﮔﮕﮖﮗﮘﮙﮚﮛﮜﮝﮞﮟﮠﮡﮢﮣﮤﮥﮦﮧﮨﮩﮪﮫﮬﮭﮮﮯﮰﮱﺀﺁﺃﺄﺅﺆﺇﺈﺉﺊﺋﺌﺍﺎﺏﺐﺑﺒﺕﺖﺗﺘﺙﺚﺛﺜﺝﺞﺟﺠﺡﺢﺣﺤﺥﺦﺧﺨﺩﺪﺫﺬﺭﺮﺯﺰﺱﺲﺳﺴﺵﺶﺷﺸﺹﺺﺻﺼﺽﺾﺿﻀﻁﻂﻃﻄﻅﻆﻇﻈﻉﻊﻋﻌﻍﻎﻏﻐﻑﻒﻓﻔﻕﻖﻗﻘﻙﻚﻛﻜﻝﻞﻟﻠﻡﻢﻣﻤﻥﻦﻧﻨﻩﻪﻫﻬﻭﻮﻯﻰﻱﻲﻳﻴىكي“” "
         self.translation_dst = 'یککیییکیبقویتتبتتتبحاوویتتبتتتبحححچدددددددددررررررررسسسصصطعففففففققکککککگگگگگللللنننننهچهههوووووووووییییییهدرشضغهبببببببححددرسعععففکککممنننلررسححسرحاایییووییحسسکببجطفقلمییرودصگویزعکبپتریفقنااببببپپپپببببتتتتتتتتتتتتففففححححححححچچچچچچچچددددددددژژررککککگگگگگگگگگگگگننننننههههههههههییییءاااووااییییااببببتتتتثثثثججججححححخخخخددذذررززسسسسششششصصصصضضضضططططظظظظععععغغغغففففققققککککللللممممننننههههوویییییییکی"" '
 
-        if self._correct_spacing or sel._decrease_repeated_chars:
+        if self._correct_spacing or self._decrease_repeated_chars:
             self.tokenizer = WordTokenizer(join_verb_parts=False)
             self.words = self.tokenizer.words
 
+        if self._correct_spacing or self._seperate_mi:
+            self.verbs = Lemmatizer(joined_verb_parts=False).verbs
+            self.lexicon = shared_lexicon(
+                ("spacing", self._correct_spacing),
+                [default_words, default_verbs],
+                lambda: SpacingLexicon(
+                    self.verbs, self.words if self._correct_spacing else {}
+                ),
+            )
+
         if self._persian_number:
             self.number_translation_src = "0123456789%٠١٢٣٤٥٦٧٨٩"
             self.number_translation_dst = "۰۱۲۳۴۵۶۷۸۹٪۰۱۲۳۴۵۶۷۸۹"
+            self.number_translations = maketrans(
+                self.number_translation_src, self.number_translation_dst
+            )
 
         if self._correct_spacing:
             self.suffixes = {
@@ -73,114 +175,189 @@ class Normalizer(object):
                 "اش",
             }
 
-            self.extra_space_patterns = [
-                (r" {2,}", " "),  # remove extra spaces
-                (r"\n{3,}", "\n\n"),  # remove extra newlines
-                (r"\u200c{2,}", "\u200c"),  # remove extra ZWNJs
-                (r"\u200c{1,} ", " "),  # remove unneded ZWNJs before space
-                (r" \u200c{1,}", " "),  # remove unneded ZWNJs after space
-                (r"[ـ\r]", ""),  # remove keshide, carriage returns
-            ]
+            self.extra_space_patterns = compile_patterns(
+                [
+                    (r" {2,}", " "),  # remove extra spaces
+                    (r"\n{3,}", "\n\n"),  # remove extra newlines
+                    (r"\u200c{2,}", "\u200c"),  # remove extra ZWNJs
+                    (r"\u200c{1,} ", " "),  # remove unneded ZWNJs before space
+                    (r" \u200c{1,}", " "),  # remove unneded ZWNJs after space
+                    (r"[ـ\r]", ""),  # remove keshide, carriage returns
+                ]
+            )
 
             punc_after, punc_before = r"\.:!،؛؟»\]\)\}", r"«\[\(\{"
 
-            self.punctuation_spacing_patterns = [
-                # remove space before and after quotation
-                ('" ([^\n"]+) "', r'"\1"'),
-                (" ([" + punc_after + "])", r"\1"),  # remove space before
-                ("([" + punc_before + "]) ", r"\1"),  # remove space after
-                # put space after . and :
-                (
-                    "([" + punc_after[:3] + "])([^ " + punc_after + "\d۰۱۲۳۴۵۶۷۸۹])",
-                    r"\1 \2",
-                ),
-                (
-                    "([" + punc_after[3:] + "])([^ " + punc_after + "])",
-                    r"\1 \2",
-                ),  # put space after
-                (
-                    "([^ " + punc_before + "])([" + punc_before + "])",
-                    r"\1 \2",
-                ),  # put space before
-                # put space after number; e.g., به طول ۹متر -> به طول ۹ متر
-                ("(\d)([آابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی])", r"\1 \2"),
-                # put space after number; e.g., به طول۹ -> به طول ۹
-                ("([آابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی])(\d)", r"\1 \2"),
-            ]
-
-            self.affix_spacing_patterns = [
-                (r"([^ ]ه) ی ", r"\1‌ی "),  # fix ی space
-                (r"(^| )(ن?می) ", r"\1\2‌"),  # put zwnj after می, نمی
-                # put zwnj before تر, تری, ترین, گر, گری, ها, های
-                (
-                    r"(?<=[^\n\d "
-                    + punc_after
-                    + punc_before
-                    + "]{2}) (تر(ین?)?|گری?|های?)(?=[ \n"
-                    + punc_after
-                    + punc_before
-                    + "]|$)",
-                    r"‌\1",
-                ),
-                # join ام, ایم, اش, اند, ای, اید, ات
-                (
-                    r"([^ ]ه) (ا(م|یم|ش|ند|ی|ید|ت))(?=[ \n" + punc_after + "]|$)",
-                    r"\1‌\2",
-                ),
-                # شنبهها => شنبه‌ها
-                ("(ه)(ها)", r"\1‌\2"),
-            ]
+            self.punctuation_spacing_patterns = compile_patterns(
+                [
+                    # remove space before and after quotation
+                    ('" ([^\n"]+) "', r'"\1"'),
+                    (" ([" + punc_after + "])", r"\1"),  # remove space before
+                    ("([" + punc_before + "]) ", r"\1"),  # remove space after
+                    # put space after . and :
+                    (
+                        "(["
+                        + punc_after[:3]
+                        + "])([^ "
+                        + punc_after
+                        + "\d۰۱۲۳۴۵۶۷۸۹])",
+                        r"\1 \2",
+                    ),
+                    (
+                        "([" + punc_after[3:] + "])([^ " + punc_after + "])",
+                        r"\1 \2",
+                    ),  # put space after
+                    (
+                        "([^ " + punc_before + "])([" + punc_before + "])",
+                        r"\1 \2",
+                    ),  # put space before
+                    # put space after number; e.g., به طول ۹متر -> به طول ۹ متر
+                    ("(\d)([آابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی])", r"\1 \2"),
+                    # put space after number; e.g., به طول۹ -> به طول ۹
+                    ("([آابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی])(\d)", r"\1 \2"),
+                ]
+            )
+
+            self.affix_spacing_patterns = compile_patterns(
+                [
+                    (r"([^ ]ه) ی ", r"\1‌ی "),  # fix ی space
+                    (r"(^| )(ن?می) ", r"\1\2‌"),  # put zwnj after می, نمی
+                    # put zwnj before تر, تری, ترین, گر, گری, ها, های
+                    (
+                        r"(?<=[^\n\d "
+                        + punc_after
+                        + punc_before
+                        + "]{2}) (تر(ین?)?|گری?|های?)(?=[ \n"
+                        + punc_after
+                        + punc_before
+                        + "]|$)",
+                        r"‌\1",
+                    ),
+                    # join ام, ایم, اش, اند, ای, اید, ات
+                    (
+                        r"([^ ]ه) (ا(م|یم|ش|ند|ی|ید|ت))(?=[ \n" + punc_after + "]|$)",
+                        r"\1‌\2",
+                    ),
+                    # شنبهها => شنبه‌ها
+                    ("(ه)(ها)", r"\1‌\2"),
+                ]
+            )
 
         if self._persian_style:
-            self.persian_style_patterns = [
-                ('"([^\n"]+)"', r"«\1»"),  # replace quotation with gyoome
-                ("([\d+])\.([\d+])", r"\1٫\2"),  # replace dot with momayez
-                (r" ?\.\.\.", " …"),  # replace 3 dots
-            ]
+            self.persian_style_patterns = compile_patterns(
+                [
+                    ('"([^\n"]+)"', r"«\1»"),  # replace quotation with gyoome
+                    ("([\d+])\.([\d+])", r"\1٫\2"),  # replace dot with momayez
+                    (r" ?\.\.\.", " …"),  # replace 3 dots
+                ]
+            )
 
         if self._decrease_repeated_chars:
-            self.more_than_two_repeat_pattern = (
-                r"([آابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی])\1{2,}"
-            )
-            self.repeated_chars_pattern = (
+            more_than_two_repeat = r"([آابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی])\1{2,}"
+            self.more_than_two_repeat_pattern = re.compile(more_than_two_repeat)
+            self.repeated_chars_pattern = re.compile(
                 r"[آابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی]*"
-                + self.more_than_two_repeat_pattern
+                + more_than_two_repeat
                 + "[آابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی]*"
             )
+            self._repeated_words = {}
+            self._repeated_words_limit = 100000
 
         if self._remove_diacritics:
-            self.diacritics_patterns = [
-                # remove FATHATAN, DAMMATAN, KASRATAN, FATHA, DAMMA, KASRA, SHADDA, SUKUN
-                ("[\u064B\u064C\u064D\u064E\u064F\u0650\u0651\u0652]", ""),
-            ]
+            # FATHATAN, DAMMATAN, KASRATAN, FATHA, DAMMA, KASRA, SHADDA, SUKUN
+            self.diacritics = "\u064B\u064C\u064D\u064E\u064F\u0650\u0651\u0652"
+            self.diacritics_translations = maketrans(self.diacritics, [None] * 8)
 
         if self._remove_specials_chars:
-            self.specials_chars_patterns = [
-                # Remove almoast all arabic unicode superscript and subscript characters in the ranges of 00600-06FF, 08A0-08FF, FB50-FDFF, and FE70-FEFF
-                (
-                    "[\u0605\u0653\u0654\u0655\u0656\u0657\u0658\u0659\u065A\u065B\u065C\u065D\u065E\u065F\u0670\u0610\u0611\u0612\u0613\u0614\u0615\u0616\u0618\u0619\u061A\u061E\u06D4\u06D6\u06D7\u06D8\u06D9\u06DA\u06DB\u06DC\u06DD\u06DE\u06DF\u06E0\u06E1\u06E2\u06E3\u06E4\u06E5\u06E6\u06E7\u06E8\u06E9\u06EA\u06EB\u06EC\u06ED\u06FD\u06FE\u08AD\u08D4\u08D5\u08D6\u08D7\u08D8\u08D9\u08DA\u08DB\u08DC\u08DD\u08DE\u08DF\u08E0\u08E1\u08E2\u08E3\u08E4\u08E5\u08E6\u08E7\u08E8\u08E9\u08EA\u08EB\u08EC\u08ED\u08EE\u08EF\u08F0\u08F1\u08F2\u08F3\u08F4\u08F5\u08F6\u08F7\u08F8\u08F9\u08FA\u08FB\u08FC\u08FD\u08FE\u08FF\uFBB2\uFBB3\uFBB4\uFBB5\uFBB6\uFBB7\uFBB8\uFBB9\uFBBA\uFBBB\uFBBC\uFBBD\uFBBE\uFBBF\uFBC0\uFBC1\uFC5E\uFC5F\uFC60\uFC61\uFC62\uFC63\uFCF2\uFCF3\uFCF4\uFD3E\uFD3F\uFE70\uFE71\uFE72\uFE76\uFE77\uFE78\uFE79\uFE7A\uFE7B\uFE7C\uFE7D\uFE7E\uFE7F\uFDFA\uFDFB]",
-                    "",
-                ),
-            ]
+            # almoast all arabic unicode superscript and subscript characters in the ranges of 00600-06FF, 08A0-08FF, FB50-FDFF, and FE70-FEFF
+            self.specials_chars = "\u0605\u0653\u0654\u0655\u0656\u0657\u0658\u0659\u065A\u065B\u065C\u065D\u065E\u065F\u0670\u0610\u0611\u0612\u0613\u0614\u0615\u0616\u0618\u0619\u061A\u061E\u06D4\u06D6\u06D7\u06D8\u06D9\u06DA\u06DB\u06DC\u06DD\u06DE\u06DF\u06E0\u06E1\u06E2\u06E3\u06E4\u06E5\u06E6\u06E7\u06E8\u06E9\u06EA\u06EB\u06EC\u06ED\u06FD\u06FE\u08AD\u08D4\u08D5\u08D6\u08D7\u08D8\u08D9\u08DA\u08DB\u08DC\u08DD\u08DE\u08DF\u08E0\u08E1\u08E2\u08E3\u08E4\u08E5\u08E6\u08E7\u08E8\u08E9\u08EA\u08EB\u08EC\u08ED\u08EE\u08EF\u08F0\u08F1\u08F2\u08F3\u08F4\u08F5\u08F6\u08F7\u08F8\u08F9\u08FA\u08FB\u08FC\u08FD\u08FE\u08FF\uFBB2\uFBB3\uFBB4\uFBB5\uFBB6\uFBB7\uFBB8\uFBB9\uFBBA\uFBBB\uFBBC\uFBBD\uFBBE\uFBBF\uFBC0\uFBC1\uFC5E\uFC5F\uFC60\uFC61\uFC62\uFC63\uFCF2\uFCF3\uFCF4\uFD3E\uFD3F\uFE70\uFE71\uFE72\uFE76\uFE77\uFE78\uFE79\uFE7A\uFE7B\uFE7C\uFE7D\uFE7E\uFE7F\uFDFA\uFDFB"
+            self.specials_chars_translations = maketrans(
+                self.specials_chars, [None] * len(self.specials_chars)
+            )
 
         if self._seperate_mi:
-            self.verbs = Lemmatizer(joined_verb_parts=False).verbs
-            self.joint_mi_patterns = r"\bن?می[آابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی]+"
+            self.joint_mi_patterns = re.compile(
+                r"\b(ن?می)([آابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی]+)"
+            )
 
         if self._unicodes_replacement:
-            self.replacements = [
-                ("﷽", "بسم الله الرحمن الرحیم"),
-                ("﷼", "ریال"),
-                ("(ﷰ|ﷹ)", "صلی"),
-                ("ﷲ", "الله"),
-                ("ﷳ", "اکبر"),
-                ("ﷴ", "محمد"),
-                ("ﷵ", "صلعم"),
-                ("ﷶ", "رسول"),
-                ("ﷷ", "علیه"),
-                ("ﷸ", "وسلم"),
-                ("ﻵ|ﻶ|ﻷ|ﻸ|ﻹ|ﻺ|ﻻ|ﻼ", "لا"),
-            ]
+            self.replacements = {
+                "﷽": "بسم الله الرحمن الرحیم",
+                "﷼": "ریال",
+                "ﷰ": "صلی",
+                "ﷹ": "صلی",
+                "ﷲ": "الله",
+                "ﷳ": "اکبر",
+                "ﷴ": "محمد",
+                "ﷵ": "صلعم",
+                "ﷶ": "رسول",
+                "ﷷ": "علیه",
+                "ﷸ": "وسلم",
+                "ﻵ": "لا",
+                "ﻶ": "لا",
+                "ﻷ": "لا",
+                "ﻸ": "لا",
+                "ﻹ": "لا",
+                "ﻺ": "لا",
+                "ﻻ": "لا",
+                "ﻼ": "لا",
+            }
+            self.replacements_pattern = re.compile(
+                "|".join(map(re.escape, self.replacements))
+            )
+
+        self.compile_plan()
+
+    def compile_plan(self):
+        """مراحل نرمال‌سازی را یک بار پیش از اجرا آماده می‌کند.
+        
+        جایگزینی حروف، ارقام فارسی، حذف اعراب و حذف کاراکترهای خاص همگی در یک
+        جدول `translate` ادغام می‌شوند و سایر مراحل به ترتیبِ اجرا در
+        `self.plan` قرار می‌گیرند. اگر `persian_style` فعال باشد اعراب مثل قبل
+        پس از آن حذف می‌شوند و اگر یکی از مراحل `persian_style`،
+        `correct_spacing` یا `unicodes_replacement` فعال باشد کاراکترهای خاص
+        مثل قبل پس از `unicodes_replacement` حذف می‌شوند. اگر پس از ساخت
+        نرمالایزر، الگوها یا جداول آن را تغییر دادید، این تابع را دوباره
+        فراخوانی کنید.
+        
+        """
+
+        self.translations = maketrans(self.translation_src, self.translation_dst)
+        if self._persian_number:
+            self.translations = merge_translations(
+                self.translations, self.number_translations
+            )
+        # persian_style sees the diacritics, e.g. a shadda after a dot keeps it
+        # from becoming a decimal separator
+        if self._remove_diacritics and not self._persian_style:
+            self.translations = merge_translations(
+                self.translations, self.diacritics_translations
+            )
+        # the regex stages see the special characters, e.g. one after a quote
+        # keeps the space that follows it
+        regex_stages = (
+            self._persian_style or self._correct_spacing or self._unicodes_replacement
+        )
+        if self._remove_specials_chars and not regex_stages:
+            self.translations = merge_translations(
+                self.translations, self.specials_chars_translations
+            )
+
+        self.plan = []
+        if self._persian_style:
+            self.plan.append(self.persian_style)
+            if self._remove_diacritics:
+                self.plan.append(self.remove_diacritics)
+        if self._correct_spacing:
+            self.plan.append(self.correct_spacing)
+        if self._unicodes_replacement:
+            self.plan.append(self.unicodes_replacement)
+        if self._remove_specials_chars and regex_stages:
+            self.plan.append(self.remove_specials_chars)
+        if self._decrease_repeated_chars:
+            self.plan.append(self.decrease_repeated_chars)
+        if self._seperate_mi:
+            self.plan.append(self.seperate_mi)
 
     def normalize(self, text):
         """متن را نرمال‌سازی می‌کند.
@@ -189,6 +366,10 @@ class Normalizer(object):
             >>> normalizer = Normalizer()
             >>> normalizer.normalize('اِعلام کَرد : « زمین لرزه ای به بُزرگیِ 6 دهم ریشتر ...»')
             'اعلام کرد: «زمین‌لرزه‌ای به بزرگی ۶ دهم ریشتر…»'
+            >>> normalizer.normalize('١.ّ٠')
+            '۱.۰'
+            >>> normalizer.normalize('"ٰ سلام "')
+            '« سلام»'
         
         Args:
             text (str): متنی که باید نرمال‌سازی شود.
@@ -198,35 +379,50 @@ class Normalizer(object):
         
         """
 
-        translations = maketrans(self.translation_src, self.translation_dst)
-        text = text.translate(translations)
-
-        if self._persian_style:
-            text = self.persian_style(text)
-
-        if self._persian_number:
-            text = self.persian_number(text)
-
-        if self._remove_diacritics:
-            text = self.remove_diacritics(text)
-
-        if self._correct_spacing:
-            text = self.correct_spacing(text)
-
-        if self._unicodes_replacement:
-            text = self.unicodes_replacement(text)
-
-        if self._remove_specials_chars:
-            text = self.remove_specials_chars(text)
-
-        if self._decrease_repeated_chars:
-            text = self.decrease_repeated_chars(text)
-
-        if self._seperate_mi:
-            text = self.seperate_mi(text)
+        text = text.translate(self.translations)
+        for step in self.plan:
+            text = step(text)
 
         return text
 
+    def normalize_many(self, texts, workers=None, chunksize=256):
+        """متن‌های ورودی را به‌صورت دسته‌ای و در چند پردازه نرمال‌سازی می‌کند.
+        
+        هر پردازه یک بار نرمالایزری با همین تنظیمات می‌سازد و دسته‌های
+        `chunksize`تایی از متن‌ها را پردازش می‌کند. نتایج به همان ترتیب ورودی
+        برگردانده می‌شوند و حداکثر دو دسته برای هر پردازه در حافظه نگه داشته
+        می‌شود؛ بنابراین ورودی می‌تواند هر `Iterator`ی با طول نامحدود باشد.
+        
+        Examples:
+            >>> normalizer = Normalizer()
+            >>> list(normalizer.normalize_many(['نمیدانم چه میگفت', 'کتاب ها'], workers=2))
+            ['نمی‌دانم چه می‌گفت', 'کتاب‌ها']
+        
+        Args:
+            texts (Iterable[str]): متن‌هایی که باید نرمال‌سازی شوند.
+            workers (int, optional): تعداد پردازه‌ها. اگر `None` باشد به تعداد هسته‌های پردازنده و اگر `1` باشد بدون پردازهٔ جدید اجرا می‌شود.
+            chunksize (int, optional): تعداد متن‌هایی که در هر نوبت به یک پردازه سپرده می‌شود.
+        
+        Yields:
+            (str): متن نرمال‌سازی‌شدهٔ بعدی.
+        
+        """
+        if workers == 1:
+            for text in texts:
+                yield self.normalize(text)
+            return
+
+        workers = workers or cpu_count()
+        for text in imap_chunks(
+            _normalize_chunk,
+            texts,
+            workers,
+            chunksize,
+            initializer=_init_normalize_worker,
+            initargs=(self.__class__, self._options),
+        ):
+            yield text
+
     def correct_spacing(self, text):
         text = regex_replace(self.extra_space_patterns, text)
 
@@ -260,7 +456,7 @@ class Normalizer(object):
             (str): متنی بدون اعراب.
         
         """
-        return regex_replace(self.diacritics_patterns, text)
+        return text.translate(self.diacritics_translations)
 
     def remove_specials_chars(self, text):
         """برخی از کاراکترها و نشانه‌های خاص را که کاربردی در پردازش متن ندارند حذف
@@ -278,7 +474,7 @@ class Normalizer(object):
             (str): متنی بدون کاراکترها و نشانه‌های اضافه.
         
         """
-        return regex_replace(self.specials_chars_patterns, text)
+        return text.translate(self.specials_chars_translations)
 
     def decrease_repeated_chars(self, text):
         """تکرارهای زائد حروف را در کلماتی مثل سلامممممم حذف می‌کند و در مواردی که
@@ -297,21 +493,27 @@ class Normalizer(object):
         
         """
 
-        matches = re.finditer(self.repeated_chars_pattern, text)
+        return self.repeated_chars_pattern.sub(self._decrease_repeated_word, text)
 
-        for m in matches:
-            word = m.group()
-            if word not in self.words:
-                no_repeat = re.sub(self.more_than_two_repeat_pattern, r"\1", word)
-                two_repeat = re.sub(self.more_than_two_repeat_pattern, r"\1\1", word)
+    def _decrease_repeated_word(self, match):
+        word = match.group()
+        if word in self._repeated_words:
+            return self._repeated_words[word]
 
-                if (no_repeat in self.words) != (two_repeat in self.words):
-                    r = no_repeat if no_repeat in self.words else two_repeat
-                    text = text.replace(word, r)
-                else:
-                    text = text.replace(word, two_repeat)
+        result = word
+        if word not in self.words:
+            no_repeat = self.more_than_two_repeat_pattern.sub(r"\1", word)
+            two_repeat = self.more_than_two_repeat_pattern.sub(r"\1\1", word)
 
-        return text
+            if (no_repeat in self.words) != (two_repeat in self.words):
+                result = no_repeat if no_repeat in self.words else two_repeat
+            else:
+                result = two_repeat
+
+        if len(self._repeated_words) >= self._repeated_words_limit:
+            self._repeated_words.clear()
+        self._repeated_words[word] = result
+        return result
 
     def persian_style(self, text):
         """برخی از حروف و نشانه‌ها را با حروف و نشانه‌های فارسی جایگزین می‌کند.
@@ -345,10 +547,7 @@ class Normalizer(object):
             (str): متنی با اعداد و علامت ٪ فارسی.
         
         """
-        translations = maketrans(
-            self.number_translation_src, self.number_translation_dst
-        )
-        return text.translate(translations)
+        return text.translate(self.number_translations)
 
     def unicodes_replacement(self, text):
         """برخی از کاراکترهای خاص یونیکد را با معادلِ نرمال آن جایگزین می‌کند. غالباً
@@ -384,10 +583,9 @@ class Normalizer(object):
         
         """
 
-        for old, new in self.replacements:
-            text = re.sub(old, new, text)
-
-        return text
+        return self.replacements_pattern.sub(
+            lambda match: self.replacements[match.group()], text
+        )
 
     def seperate_mi(self, text):
         """پیشوند «می» و «نمی» را در افعال جدا کرده و با نیم‌فاصله می‌چسباند.
@@ -404,13 +602,15 @@ class Normalizer(object):
             (str): متنی با «می» و «نمی» جدا شده.
         
         """
-        matches = re.findall(r"\bن?می[آابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی]+", text)
-        for m in matches:
-            r = re.sub("^(ن?می)", r"\1‌", m)
-            if r in self.verbs:
-                text = text.replace(m, r)
 
-        return text
+        def separate(match):
+            prefix, rest = match.groups()
+            node = self.lexicon.walk(self.lexicon.walk(self.lexicon.root, prefix), rest)
+            if self.lexicon.kind(node) & SpacingLexicon.verb:
+                return prefix + "‌" + rest
+            return match.group()
+
+        return self.joint_mi_patterns.sub(separate, text)
 
     def token_spacing(self, tokens):
         """توکن‌های ورودی را به فهرستی از توکن‌های نرمال‌سازی شده تبدیل می‌کند.
@@ -440,17 +640,14 @@ class Normalizer(object):
         
         """
 
-        result = []
+        walk, root = self.lexicon.walk, self.lexicon.root
+        result, nodes = [], []
         for t, token in enumerate(tokens):
             joined = False
 
             if result:
-                token_pair = result[-1] + "‌" + token
-                if (
-                    token_pair in self.verbs
-                    or token_pair in self.words
-                    and self.words[token_pair][0] > 0
-                ):
+                node = walk(nodes[-1], token) if nodes[-1] else None
+                if node and None in node:
                     joined = True
 
                     if (
@@ -463,9 +660,22 @@ class Normalizer(object):
                     joined = True
 
             if joined:
-                result.pop()
-                result.append(token_pair)
+                result[-1] = result[-1] + "‌" + token
+                nodes[-1] = node
             else:
                 result.append(token)
+                nodes.append(walk(root, token))
 
         return result
+
+
+_worker_normalizer = None
+
+
+def _init_normalize_worker(normalizer_class, options):
+    global _worker_normalizer
+    _worker_normalizer = normalizer_class(**options)
+
+
+def _normalize_chunk(texts):
+    return [_worker_normalizer.normalize(text) for text in texts]
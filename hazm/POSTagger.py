@@ -8,6 +8,8 @@
 """
 
 from __future__ import unicode_literals
+import io, subprocess, threading
+from nltk.internals import find_binary
 from nltk.tag import stanford
 from .SequenceTagger import SequenceTagger
 
@@ -25,13 +27,37 @@ class POSTagger(SequenceTagger):
 class StanfordPOSTagger(stanford.StanfordPOSTagger):
     """
     
+    Args:
+        model_filename (str): مسیر مدل برچسب‌زن استنفورد.
+        path_to_jar (str): مسیر فایل `stanford-postagger.jar`.
+        persistent (bool, optional): اگر `True` باشد به‌جای اجرای جاوا در هر
+            فراخوانی، پردازه‌های جاوا با مدل بارگذاری‌شده زنده نگه داشته
+            می‌شوند و جملات سطر به سطر برای آن‌ها فرستاده می‌شود. پردازه‌ها با
+            [close()][hazm.POSTagger.StanfordPOSTagger.close] یا پایان بلوک
+            `with` بسته می‌شوند.
+        pool_size (int, optional): حداکثر تعداد پردازه‌های جاوا در حالت
+            `persistent`؛ هر پردازه در هر لحظه به یک فراخوانی پاسخ می‌دهد.
+    
     """
 
-    def __init__(self, model_filename, path_to_jar, *args, **kwargs):
+    def __init__(
+        self, model_filename, path_to_jar, *args, persistent=False, pool_size=1, **kwargs
+    ):
         self._SEPARATOR = "/"
         super(stanford.StanfordPOSTagger, self).__init__(
             model_filename=model_filename, path_to_jar=path_to_jar, *args, **kwargs
         )
+        self.persistent = persistent
+        self.pool_size = pool_size
+        self._sessions, self._idle_sessions = [], []
+        self._sessions_condition = threading.Condition()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     def tag(self, tokens):
         """
@@ -49,4 +75,136 @@ class StanfordPOSTagger(stanford.StanfordPOSTagger):
     
     """
         refined = map(lambda s: [w.replace(" ", "_") for w in s], sentences)
+        if self.persistent:
+            return self._tag_with_session(refined)
         return super(stanford.StanfordPOSTagger, self).tag_sents(refined)
+
+    def _start_session(self):
+        java_bin = find_binary(
+            "java",
+            env_vars=["JAVAHOME", "JAVA_HOME"],
+            binary_names=["java.exe"],
+            verbose=False,
+        )
+        options = self.java_options
+        if isinstance(options, str):
+            options = options.split()
+        command = (
+            [java_bin]
+            + list(options or [])
+            + ["-cp", self._stanford_jar]
+            + [
+                "edu.stanford.nlp.tagger.maxent.MaxentTagger",
+                "-model",
+                self._stanford_model,
+                "-tokenize",
+                "false",
+                "-encoding",
+                self._encoding,
+            ]
+        )
+        session = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        # text pipes, each sentence is flushed to the tagger with its newline
+        session.stdin = io.TextIOWrapper(
+            session.stdin, encoding=self._encoding, line_buffering=True
+        )
+        session.stdout = io.TextIOWrapper(session.stdout, encoding=self._encoding)
+        return session
+
+    def _acquire_session(self):
+        with self._sessions_condition:
+            while (
+                not self._closed
+                and not self._idle_sessions
+                and len(self._sessions) >= self.pool_size
+            ):
+                self._sessions_condition.wait()
+            if self._closed:
+                raise ValueError("Stanford tagger is closed")
+            if self._idle_sessions:
+                return self._idle_sessions.pop()
+            # reserve a place in the pool before the slow start of the tagger
+            self._sessions.append(None)
+
+        try:
+            session = self._start_session()
+        except Exception:
+            self._release_session(None, alive=False)
+            raise
+        with self._sessions_condition:
+            self._sessions[self._sessions.index(None)] = session
+        return session
+
+    def _release_session(self, session, alive=True):
+        with self._sessions_condition:
+            # sessions in use while the tagger was closed are stopped here
+            stop = alive and self._closed
+            if alive and not stop:
+                self._idle_sessions.append(session)
+            else:
+                self._sessions.remove(session)
+            self._sessions_condition.notify()
+        if stop:
+            self._stop_session(session)
+
+    @staticmethod
+    def _stop_session(session):
+        try:
+            session.stdin.close()
+            session.wait(timeout=10)
+        except Exception:
+            session.kill()
+            session.wait()
+        finally:
+            session.stdout.close()
+
+    def _tag_with_session(self, sentences):
+        # the tagger reads one sentence per line from stdin and answers with one line
+        tagged = []
+        session = self._acquire_session()
+        try:
+            for sentence in sentences:
+                if not sentence:
+                    tagged.append([])
+                    continue
+                for attempt in range(2):
+                    try:
+                        session.stdin.write(" ".join(sentence) + "\n")
+                        line = session.stdout.readline()
+                        if not line:
+                            raise IOError("Stanford tagger session ended")
+                        break
+                    except (IOError, OSError, ValueError):
+                        # the tagger has crashed, start another one once
+                        dead, session = session, None
+                        self._stop_session(dead)
+                        self._release_session(dead, alive=False)
+                        if attempt:
+                            raise
+                        session = self._acquire_session()
+                tagged.append(self.parse_output(line)[0])
+        finally:
+            if session is not None:
+                self._release_session(session)
+        return tagged
+
+    def close(self):
+        """پردازه‌های جاوای پس‌زمینه را در حالت `persistent` می‌بندد.
+        
+        پردازه‌هایی که در حال پاسخ به فراخوانی دیگری هستند پس از پایان آن
+        بسته می‌شوند و پس از این، فراخوانی‌های جدید خطای `ValueError` می‌دهند.
+        
+        """
+        with self._sessions_condition:
+            self._closed = True
+            sessions, self._idle_sessions = self._idle_sessions, []
+            for session in sessions:
+                self._sessions.remove(session)
+            self._sessions_condition.notify_all()
+        for session in sessions:
+            self._stop_session(session)
@@ -19,6 +19,7 @@
 
 from __future__ import unicode_literals
 import os, codecs
+from operator import itemgetter
 from .Normalizer import Normalizer
 from .WordTokenizer import WordTokenizer
 
@@ -80,21 +81,12 @@ def join_verb_parts(sentence):
 
     if not hasattr(join_verb_parts, "tokenizer"):
         join_verb_parts.tokenizer = WordTokenizer()
-    before_verbs, after_verbs, verbe = (
-        join_verb_parts.tokenizer.before_verbs,
-        join_verb_parts.tokenizer.after_verbs,
-        join_verb_parts.tokenizer.verbe,
-    )
-
-    result = [("", "")]
-    for word in reversed(sentence):
-        if word[0] in before_verbs or (
-            result[-1][0] in after_verbs and word[0] in verbe
-        ):
-            result[-1] = (word[0] + "_" + result[-1][0], result[-1][1])
-        else:
-            result.append(word)
-    return list(reversed(result[1:]))
+    return [
+        ("_".join(word for word, tag in group), group[-1][1])
+        for group in join_verb_parts.tokenizer.verb_parts.groups(
+            sentence, key=itemgetter(0)
+        )
+    ]
 
 
 class PeykareReader:
@@ -0,0 +1,196 @@
+# coding: utf-8
+
+"""این ماژول شامل کلاس‌ها و توابعی برای تحلیل یکجای متن با اجزای مختلف هضم است.
+
+"""
+
+from __future__ import unicode_literals
+from collections import namedtuple
+from multiprocessing import cpu_count
+from .Normalizer import Normalizer
+from .SentenceTokenizer import SentenceTokenizer
+from .WordTokenizer import WordTokenizer
+from .utils import imap_chunks
+
+Sentence = namedtuple(
+    "Sentence", ["text", "words", "tags", "lemmas", "chunks", "dependencies"]
+)
+Sentence.__doc__ = """جملهٔ تحلیل‌شده؛ فیلد مراحلی که در خط لوله نیستند `None` است."""
+
+
+class Pipeline(object):
+    """این کلاس متن‌ها را به ترتیب از نرمال‌سازی، جمله‌یابی، توکن‌سازی،
+    برچسب‌گذاری، ریشه‌یابی، تقطیع و تجزیهٔ وابستگی عبور می‌دهد.
+    
+    جملات چند سند با هم در دسته‌هایی با حدود `batch_size` جمله پردازش می‌شوند
+    تا هر مرحله یک بار با توابع دسته‌ای خود (`tag_sents` و `parse_sents` و
+    `parse_tagged_sents`) فراخوانی شود.
+    
+    Examples:
+        >>> pipeline = Pipeline()
+        >>> document = next(pipeline.annotate(['او به مدرسه رفته بود. سلام!']))
+        >>> [sentence.words for sentence in document]
+        [['او', 'به', 'مدرسه', 'رفته_بود', '.'], ['سلام', '!']]
+    
+    Args:
+        normalizer (Normalizer, optional): نرمالایزر؛ اگر داده نشود نرمالایزر پیش‌فرض ساخته می‌شود.
+        sentence_tokenizer (SentenceTokenizer, optional): جمله‌یاب؛ اگر داده نشود جمله‌یاب پیش‌فرض ساخته می‌شود.
+        word_tokenizer (WordTokenizer, optional): توکن‌ساز؛ اگر داده نشود توکن‌ساز پیش‌فرض ساخته می‌شود.
+        tagger (POSTagger, optional): برچسب‌زن اجزای کلام.
+        lemmatizer (Lemmatizer, optional): ریشه‌یاب.
+        chunker (Chunker, optional): تقطیع‌گر؛ به برچسب‌زن نیاز دارد.
+        parser (DependencyParser, optional): تجزیه‌گر وابستگی.
+        batch_size (int, optional): حداقل تعداد جملاتی که با هم به هر مرحله سپرده می‌شود.
+    
+    """
+
+    def __init__(
+        self,
+        normalizer=None,
+        sentence_tokenizer=None,
+        word_tokenizer=None,
+        tagger=None,
+        lemmatizer=None,
+        chunker=None,
+        parser=None,
+        batch_size=64,
+    ):
+        if chunker and not tagger:
+            raise ValueError("chunker needs a tagger in the pipeline")
+
+        self.normalizer = normalizer or Normalizer()
+        self.sentence_tokenizer = sentence_tokenizer or SentenceTokenizer()
+        self.word_tokenizer = word_tokenizer or WordTokenizer()
+        self.tagger = tagger
+        self.lemmatizer = lemmatizer
+        self.chunker = chunker
+        self.parser = parser
+        self.batch_size = batch_size
+
+    def annotate(self, documents):
+        """اسناد ورودی را تحلیل می‌کند.
+        
+        Args:
+            documents (Iterable[str]): متن اسناد.
+        
+        Yields:
+            (List[Sentence]): جملات تحلیل‌شدهٔ سند بعدی به ترتیب ورودی.
+        
+        """
+        batch, size = [], 0
+        for document in documents:
+            sentences = self.sentence_tokenizer.tokenize(
+                self.normalizer.normalize(document)
+            )
+            batch.append(sentences)
+            size += len(sentences)
+            if size >= self.batch_size:
+                for document in self.annotate_batch(batch):
+                    yield document
+                batch, size = [], 0
+
+        for document in self.annotate_batch(batch):
+            yield document
+
+    def annotate_many(self, documents, workers=None, chunksize=64):
+        """اسناد ورودی را به‌صورت دسته‌ای و در چند پردازه تحلیل می‌کند.
+        
+        هر پردازه در شروع کار یک بار این خط لوله را دریافت می‌کند. وقتی پردازه‌ها
+        با `fork` ساخته شوند (پیش‌فرض لینوکس) مدل‌های بارگذاری‌شده را به ارث
+        می‌برند؛ در غیر این صورت (مثلاً با `spawn` در ویندوز و مک) خط لوله
+        pickle می‌شود و برچسب‌زن و تقطیع‌گر مدل خود را یک بار در هر پردازه از
+        فایل می‌خوانند؛ پس باید با `model=...` از فایل خوانده شده باشند. دسته‌های `chunksize`تایی از اسناد به پردازه‌ها سپرده
+        می‌شوند، نتایج به ترتیب ورودی برگردانده می‌شوند و حداکثر دو دسته برای
+        هر پردازه در صف می‌ماند.
+        
+        Examples:
+            >>> pipeline = Pipeline()
+            >>> documents = pipeline.annotate_many(['سلام!', 'او رفته بود.'], workers=2)
+            >>> [[sentence.words for sentence in document] for document in documents]
+            [[['سلام', '!']], [['او', 'رفته_بود', '.']]]
+        
+        Args:
+            documents (Iterable[str]): متن اسناد.
+            workers (int, optional): تعداد پردازه‌ها. اگر `None` باشد به تعداد هسته‌های پردازنده و اگر `1` باشد بدون پردازهٔ جدید اجرا می‌شود.
+            chunksize (int, optional): تعداد اسنادی که در هر نوبت به یک پردازه سپرده می‌شود.
+        
+        Yields:
+            (List[Sentence]): جملات تحلیل‌شدهٔ سند بعدی به ترتیب ورودی.
+        
+        """
+        if workers == 1:
+            for document in self.annotate(documents):
+                yield document
+            return
+
+        workers = workers or cpu_count()
+        for document in imap_chunks(
+            _annotate_chunk,
+            documents,
+            workers,
+            chunksize,
+            initializer=_init_annotate_worker,
+            initargs=(self,),
+        ):
+            yield document
+
+    def annotate_batch(self, documents):
+        """جملات چند سند را با هم تحلیل می‌کند.
+        
+        Examples:
+            >>> pipeline = Pipeline()
+            >>> pipeline.annotate_batch([['سلام!'], []])
+            [[Sentence(text='سلام!', words=['سلام', '!'], tags=None, lemmas=None, chunks=None, dependencies=None)], []]
+        
+        Args:
+            documents (List[List[str]]): جملات نرمال‌شدهٔ هر سند.
+        
+        Returns:
+            (List[List[Sentence]]): جملات تحلیل‌شدهٔ هر سند.
+        
+        """
+        texts = [text for document in documents for text in document]
+        words = [self.word_tokenizer.tokenize(text) for text in texts]
+        tags = lemmas = chunks = dependencies = [None] * len(texts)
+
+        if texts and self.tagger:
+            tagged = list(self.tagger.tag_sents(words))
+            tags = [[tag for word, tag in sentence] for sentence in tagged]
+        if texts and self.lemmatizer:
+            flat_lemmas = iter(
+                self.lemmatizer.lemmatize_many(
+                    [word for sentence in words for word in sentence],
+                    [
+                        tag
+                        for sentence, sentence_tags in zip(words, tags)
+                        for tag in sentence_tags or [""] * len(sentence)
+                    ],
+                )
+            )
+            lemmas = [[next(flat_lemmas) for word in sentence] for sentence in words]
+        if texts and self.chunker:
+            chunks = list(self.chunker.parse_sents(tagged))
+        if texts and self.parser:
+            if self.tagger and hasattr(self.parser, "parse_tagged_sents"):
+                dependencies = list(self.parser.parse_tagged_sents(tagged))
+            elif self.tagger and hasattr(self.parser, "tagged_parse_sents"):
+                dependencies = list(self.parser.tagged_parse_sents(tagged))
+            else:
+                dependencies = list(self.parser.parse_sents(words))
+
+        sentences = iter(
+            map(Sentence, texts, words, tags, lemmas, chunks, dependencies)
+        )
+        return [[next(sentences) for text in document] for document in documents]
+
+
+_worker_pipeline = None
+
+
+def _init_annotate_worker(pipeline):
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+
+
+def _annotate_chunk(documents):
+    return list(_worker_pipeline.annotate(documents))
@@ -18,6 +18,8 @@ class SentenceTokenizer(TokenizerI):
 
     def __init__(self):
         self.pattern = re.compile(r"([!\.\?⸮؟]+)[ \n]+")
+        self.span_pattern = re.compile(r"([!\.\?⸮؟]+)[ \n]+|\n\n")
+        self.content_pattern = re.compile(r"\S(?:.*\S)?", re.DOTALL)
 
     def tokenize(self, text):
         """متن ورودی را به جملات سازندهٔ آن می‌شِکند.
@@ -40,3 +42,75 @@ class SentenceTokenizer(TokenizerI):
             for sentence in text.split("\n\n")
             if sentence.strip()
         ]
+
+    def span_tokenize(self, text):
+        """محدودهٔ جملات متن را به صورت جفت‌های `(شروع، پایان)` برمی‌گرداند.
+        
+        جملهٔ متناظر با هر محدوده، همان بخش از متن است که شکستگی‌های خط آن با
+        فاصله جایگزین شده است.
+        
+        Examples:
+            >>> tokenizer = SentenceTokenizer()
+            >>> list(tokenizer.span_tokenize('جدا کردن ساده است. تقریبا البته!'))
+            [(0, 18), (19, 32)]
+        
+        Args:
+            text (str): متنی که باید جملات آن استخراج شود.
+        
+        Yields:
+            (Tuple[int,int]): محدودهٔ جملهٔ بعدی در متن ورودی.
+        
+        """
+        start = 0
+        for match in self.span_pattern.finditer(text):
+            # sentence ending marks belong to the sentence before them
+            end = match.end(1) if match.lastindex else match.start()
+            sentence = self.content_pattern.search(text, start, end)
+            if sentence:
+                yield sentence.span()
+            start = match.end()
+
+        sentence = self.content_pattern.search(text, start)
+        if sentence:
+            yield sentence.span()
+
+    def stream(self, chunks):
+        """جملات را از دنباله‌ای از قطعه‌های متن استخراج می‌کند.
+        
+        قطعه‌ها می‌توانند خطوط یک فایل یا داده‌های دریافتی از شبکه باشند. هر
+        جمله به محض کامل شدن برگردانده می‌شود و فقط بخش ناتمام متن در حافظه
+        می‌ماند؛ خروجی با خروجی
+        [tokenize()][hazm.SentenceTokenizer.SentenceTokenizer.tokenize] روی کل
+        متن یکسان است.
+        
+        Examples:
+            >>> tokenizer = SentenceTokenizer()
+            >>> list(tokenizer.stream(['جدا کردن سا', 'ده است. تقریبا', ' البته!']))
+            ['جدا کردن ساده است.', 'تقریبا البته!']
+        
+        Args:
+            chunks (Iterable[str]): قطعه‌های متوالی متن.
+        
+        Yields:
+            (str): جملهٔ بعدی.
+        
+        """
+        text = ""
+        for chunk in chunks:
+            # a boundary can only start in the trailing run of marks and spaces
+            resume = len(text.rstrip("!.?⸮؟ \n"))
+            text += chunk
+            start = 0
+            for match in self.span_pattern.finditer(text, resume):
+                if match.end() == len(text):
+                    # the next chunk may extend this boundary
+                    break
+                end = match.end(1) if match.lastindex else match.start()
+                sentence = self.content_pattern.search(text, start, end)
+                if sentence:
+                    yield sentence.group().replace("\n", " ")
+                start = match.end()
+            text = text[start:]
+
+        for sentence in self.tokenize(text):
+            yield sentence
@@ -5,6 +5,10 @@
 """
 
 from __future__ import unicode_literals
+import copy, re, string
+from contextlib import contextmanager
+from multiprocessing import cpu_count
+from queue import Queue
 from nltk.tag.api import TaggerI
 from nltk.metrics import accuracy
 
@@ -15,14 +19,70 @@ class SequenceTagger(TaggerI):
     
     Args:
         patterns (List, optional): الگوهای لازم برای ساخت مدل.
+        backend (str, optional): اگر `numpy` باشد مدلِ ذخیره‌شده بدون Wapiti و
+            با [CRFModel][hazm.SequenceTagger.CRFModel] خوانده و اجرا می‌شود؛
+            این حالت فقط برای برچسب‌گذاری با `model=...` است.
+        batch_tokens (int, optional): حداکثر تعداد توکن‌هایی که
+            [tag_sents()][hazm.SequenceTagger.SequenceTagger.tag_sents] با هم به
+            مدل می‌سپارد؛ جمله‌ای بلندتر از آن به‌تنهایی برچسب می‌خورد.
         **options (Dict, optional): آرگومان‌های نامدارِ اختیاری.
     
     """
 
-    def __init__(self, patterns=[], **options):
-        from wapiti import Model
+    def __init__(self, patterns=[], backend="wapiti", batch_tokens=10000, **options):
+        self.patterns, self.backend, self.options = patterns, backend, options
+        self.batch_tokens = batch_tokens
+        if backend == "numpy":
+            if "model" not in options:
+                raise ValueError("the numpy backend can only load a saved model=...")
+            self.model = CRFModel(options["model"])
+        elif backend == "wapiti":
+            from wapiti import Model
 
-        self.model = Model(patterns="\n".join(patterns), **options)
+            self.model = Model(patterns="\n".join(patterns), **options)
+        else:
+            raise ValueError("unknown backend: %s" % backend)
+
+    def __getstate__(self):
+        # the wapiti model can not be pickled, so a copy loads it again from its file
+        if "model" not in self.options:
+            raise TypeError(
+                "only taggers loaded with model=... can be pickled, save the model first"
+            )
+        return {
+            "patterns": self.patterns,
+            "backend": self.backend,
+            "batch_tokens": self.batch_tokens,
+            "options": self.options,
+        }
+
+    def __setstate__(self, state):
+        SequenceTagger.__init__(
+            self,
+            state["patterns"],
+            backend=state["backend"],
+            batch_tokens=state["batch_tokens"],
+            **state["options"]
+        )
+
+    def label_sequences(self, sequences):
+        """برچسب سطرهای هر دنباله را جداگانه با مدل پیدا می‌کند.
+        
+        هر سطر ستون‌های یک توکن است که با فاصله یا tab از هم جدا شده‌اند.
+        
+        Args:
+            sequences (List[List[str]]): سطرهای هر دنباله.
+        
+        Returns:
+            (List[List[str]]): برچسب سطرهای هر دنباله.
+        
+        """
+        if self.backend == "numpy":
+            return self.model.label_sequences(sequences)
+        return [
+            self.model.label_sequence("\n".join(lines)).decode("utf8").split()
+            for lines in sequences
+        ]
 
     def train(self, sentences):
         """لیستی از جملات را می‌گیرد و بر اساس آن مدل را آموزش می‌دهد.
@@ -72,34 +132,60 @@ class SequenceTagger(TaggerI):
             (List[Tuple[str,str]]): ‌لیستی از `(توکن، برچسب)`ها.
         
         """
-        return self.tag_sents([tokens])[0]
+        return next(self.tag_sents([tokens]))
 
     def tag_sents(self, sentences):
         """جملات را در قالب لیستی از توکن‌ها دریافت می‌کند
         و در خروجی، لیستی از لیستی از `(توکن، برچسب)`ها برمی‌گرداند.
         
-        هر لیست از `(توکن، برچسب)`ها مربوط به یک جمله است.
+        هر لیست از `(توکن، برچسب)`ها مربوط به یک جمله است. جملات در دسته‌هایی
+        با حداکثر `batch_tokens` توکن برچسب می‌خورند و هر دسته پس از مصرف
+        دستهٔ قبلی خوانده می‌شود؛ پس حافظهٔ مصرفی به طول ورودی بستگی ندارد.
         
         Examples:
             >>> tagger = SequenceTagger(patterns=['*', 'u:word-%x[0,0]'])
-            >>> tagger.tag_sents([['من', 'به', 'مدرسه', 'رفته_بودم', '.']])
+            >>> list(tagger.tag_sents([['من', 'به', 'مدرسه', 'رفته_بودم', '.']]))
             [[('من', 'PRO'), ('به', 'P'), ('مدرسه', 'N'), ('رفته_بودم', 'V'), ('.', 'PUNC')]]
         
         Args:
-            sentences (List[List[str]]): لیستی از جملات که باید برچسب‌گذاری شود.
+            sentences (Iterable[List[str]]): جملاتی که باید برچسب‌گذاری شود.
         
-        Returns:
-            (List[List[Tuple[str,str]]]): لیستی از لیستی از `(توکن، برچسب)`ها.
-                    هر لیست از `(توکن،برچسب)`ها مربوط به یک جمله است.
+        Yields:
+            (List[Tuple[str,str]]): لیست `(توکن، برچسب)`های جملهٔ بعدی.
         
         """
-        sentences = list(sentences)
-        lines = "\n\n".join(["\n".join(sentence) for sentence in sentences]).replace(
-            " ", "_"
-        )
-        results = self.model.label_sequence(lines).decode("utf8")
-        tags = iter(results.strip().split("\n"))
-        return [[(word, next(tags)) for word in sentence] for sentence in sentences]
+        for batch in self.batches(sentences):
+            tags = self.label_sequences(
+                [[word.replace(" ", "_") for word in sentence] for sentence in batch]
+            )
+            for sentence, labels in zip(batch, tags):
+                yield list(zip(sentence, labels))
+
+    def batches(self, sentences):
+        """جملات را در دسته‌هایی با حداکثر `batch_tokens` توکن برمی‌گرداند.
+        
+        Examples:
+            >>> tagger = SequenceTagger(patterns=['*', 'u:word-%x[0,0]'], batch_tokens=3)
+            >>> list(tagger.batches([['من', 'رفتم'], ['سلام'], ['او', 'به', 'مدرسه', 'رفت']]))
+            [[['من', 'رفتم'], ['سلام']], [['او', 'به', 'مدرسه', 'رفت']]]
+        
+        Args:
+            sentences (Iterable[List]): جملات.
+        
+        Yields:
+            (List[List]): دستهٔ بعدی جملات.
+        
+        """
+        batch, size = [], 0
+        for sentence in sentences:
+            if batch and size + len(sentence) > self.batch_tokens:
+                yield batch
+                batch, size = [], 0
+            batch.append(sentence)
+            size += len(sentence)
+
+        if batch:
+            yield batch
 
 
 class IOBTagger(SequenceTagger):
@@ -113,20 +199,19 @@ class IOBTagger(SequenceTagger):
         Examples:
             >>> tagger = IOBTagger(patterns=['*', 'U:word-%x[0,0]', 'U:word-%x[0,1]'])
             >>> tagger.train([[('من', 'PRO', 'B-NP'), ('به', 'P', 'B-PP'), ('مدرسه', 'N', 'B-NP'), ('رفته_بودم', 'V', 'B-VP'), ('.', 'PUNC', 'O')]])
-            >>> tagger.tag_sents([[('من', 'PRO'), ('به', 'P'), ('مدرسه', 'N'), ('رفته_بودم', 'V'), ('.', 'PUNC')]])
+            >>> list(tagger.tag_sents([[('من', 'PRO'), ('به', 'P'), ('مدرسه', 'N'), ('رفته_بودم', 'V'), ('.', 'PUNC')]]))
             [[('من', 'PRO', 'B-NP'), ('به', 'P', 'B-PP'), ('مدرسه', 'N', 'B-NP'), ('رفته_بودم', 'V', 'B-VP'), ('.', 'PUNC', 'O')]]
         
         """
-        sentences = list(sentences)
-        lines = "\n\n".join(
-            [
-                "\n".join(["\t".join(word) for word in sentence])
-                for sentence in sentences
-            ]
-        ).replace(" ", "_")
-        results = self.model.label_sequence(lines).decode("utf8")
-        tags = iter(results.strip().split("\n"))
-        return [[word + (next(tags),) for word in sentence] for sentence in sentences]
+        for batch in self.batches(sentences):
+            tags = self.label_sequences(
+                [
+                    ["\t".join(word).replace(" ", "_") for word in sentence]
+                    for sentence in batch
+                ]
+            )
+            for sentence, labels in zip(batch, tags):
+                yield [word + (label,) for word, label in zip(sentence, labels)]
 
     def evaluate(self, gold):
         """
@@ -140,3 +225,555 @@ class IOBTagger(SequenceTagger):
             ([word[:-1] for word in sentence] for sentence in gold)
         )
         return accuracy(sum(gold, []), sum(tagged_sents, []))
+
+
+class TaggerPool(object):
+    """این کلاس چند نسخه از یک برچسب‌زن یا تقطیع‌گر را نگه می‌دارد تا بتوان آن را
+    هم‌زمان از چند thread فراخوانی کرد.
+    
+    هر فراخوانی یک نسخهٔ آزاد را از صف برمی‌دارد و پس از پایان کار به صف
+    برمی‌گرداند؛ اگر همهٔ نسخه‌ها مشغول باشند منتظر می‌ماند. هر نسخه مدل خود
+    را جداگانه از فایل می‌خواند، پس برچسب‌زن باید با `model=...` ساخته شده باشد.
+    Wapiti هنگام برچسب‌گذاری GIL را آزاد می‌کند و نسخه‌ها واقعاً هم‌زمان کار
+    می‌کنند.
+    
+    Examples:
+        >>> pool = TaggerPool(SequenceTagger(model='resources/postagger.model'), size=4)
+        >>> pool.tag(['من', 'به', 'مدرسه', 'رفته_بودم', '.'])
+        [('من', 'PRO'), ('به', 'P'), ('مدرسه', 'N'), ('رفته_بودم', 'V'), ('.', 'PUNC')]
+    
+    Args:
+        tagger (SequenceTagger): برچسب‌زن یا تقطیع‌گری که نسخهٔ اول است.
+        size (int, optional): تعداد نسخه‌ها؛ اگر `None` باشد به تعداد هسته‌های پردازنده.
+    
+    """
+
+    def __init__(self, tagger, size=None):
+        self.size = size or cpu_count()
+        self.taggers = Queue()
+        self.taggers.put(tagger)
+        for i in range(self.size - 1):
+            self.taggers.put(copy.copy(tagger))
+
+    @contextmanager
+    def acquire(self):
+        """یک نسخهٔ آزاد را تا پایان بلوک `with` در اختیار می‌گذارد.
+        
+        Examples:
+            >>> pool = TaggerPool(SequenceTagger(model='resources/postagger.model'), size=2)
+            >>> with pool.acquire() as tagger:
+            ...     tagger.tag(['سلام'])
+            [('سلام', 'N')]
+        
+        """
+        tagger = self.taggers.get()
+        try:
+            yield tagger
+        finally:
+            self.taggers.put(tagger)
+
+    def tag(self, tokens):
+        """مانند [tag()][hazm.SequenceTagger.SequenceTagger.tag] با یکی از نسخه‌ها."""
+        with self.acquire() as tagger:
+            return tagger.tag(tokens)
+
+    def tag_sents(self, sentences):
+        """مانند [tag_sents()][hazm.SequenceTagger.SequenceTagger.tag_sents] با
+        یکی از نسخه‌ها؛ نتیجه پیش از آزاد شدن نسخه کامل ساخته می‌شود.
+        
+        Returns:
+            (List[List[Tuple[str,str]]]): لیست `(توکن، برچسب)`های هر جمله.
+        
+        """
+        with self.acquire() as tagger:
+            return list(tagger.tag_sents(sentences))
+
+    def parse(self, sentence):
+        """مانند [parse()][hazm.Chunker.Chunker.parse] با یکی از نسخه‌های تقطیع‌گر."""
+        with self.acquire() as chunker:
+            return chunker.parse(sentence)
+
+    def parse_sents(self, sentences):
+        """مانند [parse_sents()][hazm.Chunker.Chunker.parse_sents] با یکی از
+        نسخه‌های تقطیع‌گر؛ نتیجه پیش از آزاد شدن نسخه کامل ساخته می‌شود.
+        
+        Returns:
+            (List[Tree]): درخت تقطیع‌شدهٔ هر جمله.
+        
+        """
+        with self.acquire() as chunker:
+            return list(chunker.parse_sents(sentences))
+
+
+class CRFModel(object):
+    """این کلاس مدل ذخیره‌شدهٔ Wapiti را بدون نیاز به این کتابخانه می‌خواند و
+    دنباله‌ها را با الگوریتم Viterbi و NumPy برچسب می‌زند.
+    
+    ویژگی‌ها با همان الگوهای مدل (مثل `u:` و `*:` در `data.train_postagger`)
+    ساخته می‌شوند و دنباله‌ها به ترتیب طول در دسته‌هایی با حداکثر
+    `batch_size` دنباله با هم رمزگشایی می‌شوند. برچسب‌ها با خروجی Wapiti برای
+    همان دنباله یکسان است.
+    
+    Examples:
+        >>> tagger = SequenceTagger(model='resources/postagger.model', backend='numpy')
+        >>> tagger.tag(['من', 'به', 'مدرسه', 'رفته_بودم', '.'])
+        [('من', 'PRO'), ('به', 'P'), ('مدرسه', 'N'), ('رفته_بودم', 'V'), ('.', 'PUNC')]
+    
+    Args:
+        model (str): مسیر فایل مدل Wapiti.
+        batch_size (int, optional): حداکثر تعداد دنباله‌هایی که با هم رمزگشایی می‌شوند.
+    
+    """
+
+    def __init__(self, model, batch_size=1024):
+        import numpy
+
+        self.numpy = numpy
+        self.batch_size = batch_size
+        with open(model, "rb") as model_file:
+            reader = _ModelReader(model_file.read())
+
+        header = reader.line(rb"#mdl#(?:(\d+)#)?(\d+)")
+        if header[0] not in (None, b"0", b"2"):
+            raise ValueError("only maxent and crf models are supported")
+        npats = int(reader.line(rb"#rdr#(\d+)/\d+(?:/-?\d+)?")[0])
+        if not npats:
+            raise ValueError("models without patterns are not supported")
+        self.patterns = [_Pattern(reader.string()) for p in range(npats)]
+        self.labels = [label.decode("utf8") for label in reader.strings()]
+        self.observations = {
+            observation: o for o, observation in enumerate(reader.strings())
+        }
+
+        # wapiti gives each unigram observation a weight per label and each
+        # bigram one a weight per pair of labels, one block after another; here
+        # they are rows of two matrices whose last rows are zero and used for
+        # unknown observations
+        labels, offset = len(self.labels), 0
+        unigram_offsets, bigram_offsets = [], []
+        self.unigram_rows = numpy.full(len(self.observations) + 1, -1)
+        self.bigram_rows = numpy.full(len(self.observations) + 1, -1)
+        for o, observation in enumerate(self.observations):
+            kind = b"ub*".find(observation[:1]) + 1
+            if kind & 1:
+                self.unigram_rows[o] = len(unigram_offsets)
+                unigram_offsets.append(offset)
+                offset += labels
+            if kind & 2:
+                self.bigram_rows[o] = len(bigram_offsets)
+                bigram_offsets.append(offset)
+                offset += labels * labels
+        self.unigram_rows[self.unigram_rows == -1] = len(unigram_offsets)
+        self.bigram_rows[self.bigram_rows == -1] = len(bigram_offsets)
+
+        features, weights = [], []
+        for line in reader.lines(int(header[1])):
+            feature, weight = line.split(b"=")
+            features.append(int(feature))
+            weights.append(float.fromhex(weight.decode("ascii")))
+        features, weights = numpy.array(features, dtype=int), numpy.array(weights)
+
+        unigram_offsets = numpy.array(unigram_offsets + [offset], dtype=int)
+        rows = numpy.searchsorted(unigram_offsets, features, side="right") - 1
+        columns = features - unigram_offsets[rows.clip(0)]
+        unigram = (rows >= 0) & (columns < labels)
+        self.unigram_weights = numpy.zeros((len(unigram_offsets), labels))
+        self.unigram_weights[rows[unigram], columns[unigram]] = weights[unigram]
+
+        bigram_offsets = numpy.array(bigram_offsets + [offset], dtype=int)
+        rows = numpy.searchsorted(bigram_offsets, features[~unigram], side="right") - 1
+        columns = features[~unigram] - bigram_offsets[rows]
+        self.bigram_weights = numpy.zeros((len(bigram_offsets), labels * labels))
+        self.bigram_weights[rows, columns] = weights[~unigram]
+
+        self.unigram_patterns = [
+            p for p, pattern in enumerate(self.patterns) if pattern.kind & 1
+        ]
+        self.bigram_patterns = [
+            p for p, pattern in enumerate(self.patterns) if pattern.kind & 2
+        ]
+        self._cache_limit = 100000
+
+    def label_sequences(self, sequences):
+        """برچسب سطرهای هر دنباله را پیدا می‌کند.
+        
+        Examples:
+            >>> model = CRFModel('resources/postagger.model')
+            >>> model.label_sequences([['من', 'به', 'مدرسه', 'رفته_بودم', '.']])
+            [['PRO', 'P', 'N', 'V', 'PUNC']]
+        
+        Args:
+            sequences (List[List[str]]): سطرهای هر دنباله؛ هر سطر ستون‌های یک
+                توکن است که با فاصله یا tab از هم جدا شده‌اند.
+        
+        Returns:
+            (List[List[str]]): برچسب سطرهای هر دنباله.
+        
+        """
+        # like wapiti, empty lines are skipped and columns are split on spaces
+        sequences = [
+            [line.encode("utf8").split() for line in lines if line]
+            for lines in sequences
+        ]
+        order = sorted(range(len(sequences)), key=lambda s: len(sequences[s]))
+        results = [None] * len(sequences)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start : start + self.batch_size]
+            paths = self.viterbi([sequences[s] for s in batch])
+            for s, path in zip(batch, paths):
+                results[s] = [self.labels[y] for y in path]
+
+        for pattern in self.patterns:
+            if len(pattern.cache) > self._cache_limit:
+                pattern.cache.clear()
+        return results
+
+    def viterbi(self, sequences):
+        """بهترین دنبالهٔ برچسب‌ها را برای هر دنباله از توکن‌ها پیدا می‌کند.
+        
+        Args:
+            sequences (List[List[List[bytes]]]): ستون‌های توکن‌های هر دنباله.
+        
+        Returns:
+            (List[List[int]]): شمارهٔ برچسب‌های هر دنباله.
+        
+        """
+        numpy = self.numpy
+        labels = len(self.labels)
+        lengths = numpy.array([len(sequence) for sequence in sequences], dtype=int)
+        if not lengths.any():
+            return [[] for sequence in sequences]
+
+        # the scores are summed in the order of patterns, as wapiti does, so
+        # that ties between labels are broken the same way
+        ids = self.observation_ids(sequences, lengths.max())
+        scores = numpy.zeros((len(sequences), lengths.max(), labels))
+        for rows in self.unigram_rows[ids[self.unigram_patterns]]:
+            scores += self.unigram_weights[rows]
+
+        bigram_rows = self.bigram_rows[ids[self.bigram_patterns]]
+        back = numpy.zeros((lengths.max(), len(sequences), labels), dtype=int)
+        current = scores[:, 0]
+        for t in range(1, lengths.max()):
+            transitions = numpy.zeros((len(sequences), labels * labels))
+            for rows in bigram_rows[:, :, t]:
+                transitions += self.bigram_weights[rows]
+            values = current[:, :, None] + (
+                scores[:, t, None, :]
+                + transitions.reshape(len(sequences), labels, labels)
+            )
+            back[t] = values.argmax(axis=1)
+            current = numpy.where((t < lengths)[:, None], values.max(axis=1), current)
+
+        best = current.argmax(axis=1)
+        rows = numpy.arange(len(sequences))
+        paths = numpy.zeros((len(sequences), lengths.max()), dtype=int)
+        for t in range(lengths.max() - 1, -1, -1):
+            active = t < lengths
+            paths[active, t] = best[active]
+            best = numpy.where(active, back[t, rows, best], best)
+        return [path[:length] for path, length in zip(paths.tolist(), lengths.tolist())]
+
+    def observation_ids(self, sequences, length):
+        """شمارهٔ مشاهده‌های حاصل از هر الگو را در هر موقعیت پیدا می‌کند.
+        
+        Args:
+            sequences (List[List[List[bytes]]]): ستون‌های توکن‌های هر دنباله.
+            length (int): طول دنباله‌ها پس از پر کردن.
+        
+        Returns:
+            (numpy.ndarray): آرایه‌ای به ابعاد الگوها × دنباله‌ها × `length`؛
+                موقعیت‌های خالی و مشاهده‌های ناشناخته شمارهٔ
+                `len(observations)` دارند.
+        
+        """
+        numpy = self.numpy
+        lengths = numpy.array([len(sequence) for sequence in sequences], dtype=int)
+        references = {
+            reference for pattern in self.patterns for reference in pattern.references
+        }
+        width = max(
+            [abs(offset) for absolute, offset, column in references if not absolute]
+            + [0]
+        )
+
+        # the tokens of each column in one array, every sequence padded with
+        # what wapiti uses for the positions out of it
+        columns = {}
+        for column in {column for absolute, offset, column in references}:
+            tokens = []
+            for sequence in sequences:
+                tokens += [_outside(p, 0) for p in range(-width, 0)]
+                tokens += [
+                    token[column] if column < len(token) else None for token in sequence
+                ]
+                tokens += [
+                    _outside(len(sequence) + p, len(sequence)) for p in range(width)
+                ]
+            columns[column] = numpy.array(tokens, dtype=object)
+
+        ranks = numpy.arange(lengths.sum())
+        ranks -= numpy.repeat(numpy.cumsum(lengths) - lengths, lengths)
+        starts = numpy.cumsum(lengths + 2 * width) - lengths - width
+        positions = numpy.repeat(starts, lengths) + ranks
+
+        values = {}
+        for absolute, offset, column in references:
+            if absolute:
+                tokens = [
+                    _absolute_token(sequence, offset, column) for sequence in sequences
+                ]
+                tokens = numpy.repeat(numpy.array(tokens, dtype=object), lengths)
+            else:
+                tokens = columns[column][positions + offset]
+            values[absolute, offset, column] = tokens
+
+        ids = numpy.full(
+            (len(self.patterns), len(sequences), length), len(self.observations)
+        )
+        cells = numpy.repeat(numpy.arange(len(sequences)) * length, lengths) + ranks
+        for p, pattern in enumerate(self.patterns):
+            ids.reshape(len(self.patterns), -1)[p, cells] = pattern.ids(
+                [values[reference] for reference in pattern.references],
+                len(ranks),
+                self.observations,
+            )
+        return ids
+
+
+class _ModelReader(object):
+    # reads the plain text format of wapiti's mdl_save
+    def __init__(self, data):
+        self.data, self.position = data, 0
+
+    def match(self, pattern):
+        match = re.compile(pattern).match(self.data, self.position)
+        if not match:
+            raise ValueError("invalid model format")
+        self.position = match.end()
+        return match.groups()
+
+    def line(self, pattern):
+        return self.match(pattern + rb"\n")
+
+    def string(self):
+        # netstrings are written as `length:content,`
+        size = int(self.match(rb"(\d+):")[0])
+        value = self.data[self.position : self.position + size]
+        self.position += size
+        self.match(rb",\n")
+        return value
+
+    def strings(self):
+        return [self.string() for i in range(int(self.line(rb"#qrk#(\d+)")[0]))]
+
+    def lines(self, count):
+        lines = self.data[self.position :].split(b"\n", count)[:count]
+        if len(lines) < count:
+            raise ValueError("invalid model format")
+        return lines
+
+
+class _Pattern(object):
+    # a wapiti pattern compiled like pat_comp and applied like pat_exec in
+    # wapiti's pattern.c, including its byte-wise regular expressions
+    def __init__(self, source):
+        self.source = source
+        self.kind = {b"u": 1, b"b": 2, b"*": 3, b"%": 3}.get(source[:1], 0)
+        self.items, self.references, self.cache = [], [], {}
+
+        position = 0
+        while position < len(source):
+            if source[position : position + 1] != b"%":
+                end = source.find(b"%", position)
+                end = len(source) if end == -1 else end
+                self.items.append(("s", False, source[position:end]))
+                position = end
+                continue
+
+            command = source[position + 1 : position + 2]
+            if command.lower() not in (b"x", b"t", b"m"):
+                raise ValueError("unknown command type: %r" % command)
+            match = re.compile(rb"\[(@?)([+-]?\d+),(\d+)").match(source, position + 2)
+            if not match:
+                raise ValueError("invalid pattern: %r" % source)
+            self.references.append(
+                (bool(match.group(1)), int(match.group(2)), int(match.group(3)))
+            )
+            position, argument = match.end(), None
+            if command.lower() != b"x":
+                position += 2
+                start = position
+                while position < len(source) and source[position] != ord('"'):
+                    position += 2 if source[position] == ord("\\") else 1
+                if position >= len(source):
+                    raise ValueError("unended argument: %r" % source)
+                argument = _rex_compile(source[start:position], command.lower() == b"m")
+                position += 1
+            if source[position : position + 1] != b"]":
+                raise ValueError("missing end of pattern: %r" % source)
+            position += 1
+            self.items.append(
+                (command.lower().decode("ascii"), command.isupper(), argument)
+            )
+
+    def ids(self, values, count, observations):
+        # values holds the tokens each command refers to at every position
+        if len(values) == 1:
+            keys = values[0]
+        else:
+            keys = list(zip(*values)) if values else [()] * count
+
+        cache = self.cache
+        for key in set(keys).difference(cache):
+            if key is None or (type(key) is tuple and None in key):
+                raise ValueError("missing tokens, cannot apply pattern")
+            cache[key] = observations.get(self.observation(key), len(observations))
+        return list(map(cache.__getitem__, keys))
+
+    def observation(self, key):
+        values = iter([key] if len(self.references) == 1 else key)
+        parts = []
+        for command, caps, argument in self.items:
+            if command == "s":
+                parts.append(argument)
+                continue
+
+            value = next(values)
+            if command == "t":
+                value = b"false" if argument(value)[0] == -1 else b"true"
+            elif command == "m":
+                position, size = argument(value)
+                value = b"" if position == -1 else value[position : position + size]
+            parts.append(value.lower() if caps else value)
+        return b"".join(parts)
+
+
+def _outside(position, length):
+    # the token wapiti uses for positions before or after a sequence
+    if position < 0:
+        return b"_x-%d" % -position if position > -5 else b"_x-#"
+    return b"_x+%d" % (position - length + 1) if position < length + 4 else b"_x+#"
+
+
+def _absolute_token(sequence, offset, column):
+    position = offset + len(sequence) if offset < 0 else offset - 1
+    if not 0 <= position < len(sequence):
+        return _outside(position, len(sequence))
+    return sequence[position][column] if column < len(sequence[position]) else None
+
+
+# character classes of wapiti's regular expressions in the C locale
+_rex_classes = {
+    ord("a"): frozenset(string.ascii_letters.encode()),
+    ord("d"): frozenset(string.digits.encode()),
+    ord("l"): frozenset(string.ascii_lowercase.encode()),
+    ord("p"): frozenset(string.punctuation.encode()),
+    ord("s"): frozenset(string.whitespace.encode()),
+    ord("u"): frozenset(string.ascii_uppercase.encode()),
+    ord("w"): frozenset((string.ascii_letters + string.digits).encode()),
+}
+
+
+def _rex_matchit(regex, i, text, j):
+    if j >= len(text):
+        return False
+    if regex[i] == ord("."):
+        return True
+    if regex[i] == ord("\\"):
+        escaped = regex[i + 1] if i + 1 < len(regex) else 0
+        if escaped | 32 in _rex_classes:
+            return (text[j] in _rex_classes[escaped | 32]) != (escaped < ord("a"))
+        return escaped == text[j]
+    return regex[i] == text[j]
+
+
+def _rex_matchme(regex, i, text, j, size):
+    # returns whether the rest of regex matches and the updated match length,
+    # which is changed on failed branches just like in wapiti
+    if i >= len(regex):
+        return True, size
+    if regex[i:] == b"$":
+        return j >= len(text), size
+    if regex[i] in b"*?":
+        raise ValueError("unescaped * or ? in regexp: %r" % regex)
+
+    following = i + 1 + (regex[i] == ord("\\"))
+    if regex[following : following + 1] == b"*":
+        while True:
+            saved = size
+            matched, size = _rex_matchme(regex, following + 1, text, j, size)
+            if matched:
+                return True, size
+            size = saved + 1
+            j += 1
+            if not _rex_matchit(regex, i, text, j - 1):
+                return False, size
+    if regex[following : following + 1] == b"?":
+        if _rex_matchit(regex, i, text, j):
+            matched, size = _rex_matchme(regex, following + 1, text, j + 1, size + 1)
+            if matched:
+                return True, size
+            size -= 1
+        return _rex_matchme(regex, following + 1, text, j, size)
+    if _rex_matchit(regex, i, text, j):
+        return _rex_matchme(regex, following, text, j + 1, size + 1)
+    return False, size + 1
+
+
+def _rex_match(regex, text):
+    # returns the position and length of the first match or -1
+    if regex[:1] == b"^":
+        matched, size = _rex_matchme(regex, 1, text, 0, 0)
+        return (0, size) if matched else (-1, 0)
+    for position in range(len(text) + 1):
+        matched, size = _rex_matchme(regex, 0, text, position, 0)
+        if matched:
+            return position, size
+    return -1, 0
+
+
+def _rex_compile(regex, sized=True):
+    # returns a function finding the position and length of the first match of
+    # regex like _rex_match, using an equivalent python expression if possible:
+    # both backtrack in the same order, `*` being lazy and `?` greedy, but
+    # wapiti miscounts the length when something after a `?` fails first
+    anchored = regex[:1] == b"^"
+    expression, optional, i = [], False, int(anchored)
+    while i < len(regex):
+        if regex[i:] == b"$":
+            expression.append(rb"\Z")
+            break
+        if regex[i] in b"*?":
+            raise ValueError("unescaped * or ? in regexp: %r" % regex)
+        if regex[i] == ord("\\"):
+            if i + 1 == len(regex):
+                return lambda text: _rex_match(regex, text)
+            escaped = regex[i + 1]
+            if escaped | 32 in _rex_classes:
+                negation = "^" if escaped < ord("a") else ""
+                characters = bytes(sorted(_rex_classes[escaped | 32]))
+                atom = b"[%s%s]" % (negation.encode(), re.escape(characters))
+            else:
+                atom = re.escape(bytes([escaped]))
+            i += 2
+        else:
+            atom = rb"." if regex[i] == ord(".") else re.escape(regex[i : i + 1])
+            i += 1
+
+        repetition = regex[i : i + 1]
+        if optional and sized and repetition != b"?":
+            return lambda text: _rex_match(regex, text)
+        if repetition in (b"*", b"?"):
+            i += 1
+        optional = optional or repetition == b"?"
+        expression.append(atom + {b"*": b"*?", b"?": b"?"}.get(repetition, b""))
+
+    compiled = re.compile(b"".join(expression), re.DOTALL)
+    search = compiled.match if anchored else compiled.search
+
+    def match(text):
+        found = search(text)
+        return (found.start(), found.end() - found.start()) if found else (-1, 0)
+
+    return match
@@ -38,6 +38,25 @@ class Stemmer(StemmerI):
             "‌",
         ]
 
+    @property
+    def ends(self):
+        """پسوندهایی که به همین ترتیب از انتهای کلمه حذف می‌شوند.
+        
+        """
+        return self._ends
+
+    @ends.setter
+    def ends(self, ends):
+        # the suffixes are kept reversed in a trie, so the end of a word is read
+        # once to find every suffix it has; the "" key holds their indices
+        self._ends = ends
+        self._suffixes = {}
+        for index, end in enumerate(ends):
+            node = self._suffixes
+            for char in reversed(end):
+                node = node.setdefault(char, {})
+            node[""] = node.get("", ()) + (index,)
+
     def stem(self, word):
         """ریشهٔ کلمه را پیدا می‌کند.
         
@@ -67,14 +86,48 @@ class Stemmer(StemmerI):
         """
 
         if word.endswith("ۀ"):
-            word = word[:-1] + "ه"
+            return word[:-1] + "ه"
 
-        else:
-            iteration = len(self.ends)
-            while iteration:
-                for end in self.ends:
-                    if word.endswith(end):
-                        word = word[: -len(end)]
-                iteration -= 1
+        # each pass removes the suffixes in the order of ends, once a pass
+        # removes nothing the next ones would not either
+        for iteration in range(len(self.ends)):
+            last, stripped = -1, False
+            while True:
+                node, index, size = self._suffixes, None, 0
+                for length, char in enumerate(reversed(word), 1):
+                    node = node.get(char)
+                    if node is None:
+                        break
+                    for end in node.get("", ()):
+                        if last < end and (index is None or end < index):
+                            index, size = end, length
+                if index is None:
+                    break
+                word, last, stripped = word[:-size], index, True
+            if not stripped:
+                break
 
         return word
+
+    def stem_many(self, words):
+        """ریشهٔ کلمات ورودی را پیدا می‌کند.
+        
+        هر کلمهٔ تکراری فقط یک بار ریشه‌یابی می‌شود.
+        
+        Examples:
+            >>> stemmer = Stemmer()
+            >>> stemmer.stem_many(['کتاب‌ها', 'خانۀ', 'کتاب‌ها'])
+            ['کتاب', 'خانه', 'کتاب']
+        
+        Args:
+            words (List[str]): کلماتی که باید ریشهٔ آن‌ها پیدا شود.
+        
+        Returns:
+            (List[str]): ریشهٔ هر کلمه به ترتیب ورودی.
+        
+        """
+        stems = {}
+        for word in words:
+            if word not in stems:
+                stems[word] = self.stem(word)
+        return [stems[word] for word in words]
@@ -5,7 +5,9 @@
 """
 
 from __future__ import unicode_literals
+from math import log
 from .Lemmatizer import Lemmatizer
+from .utils import default_verbs, default_words, shared_lexicon
 
 
 class TokenSplitter:
@@ -13,10 +15,48 @@ class TokenSplitter:
     
     """
 
+    max_suffix = 8
+    suffix_score = -3.0
+
     def __init__(self):
         self.lemmatizer = Lemmatizer()
         self.lemmatize = self.lemmatizer.lemmatize
         self.words = self.lemmatizer.words
+        self._prefixes = None
+
+    @property
+    def prefixes(self):
+        """لگاریتم احتمال کلمات و صورت‌های صرفی افعال به همراه همهٔ پیشوندهای آن‌ها.
+        
+        احتمال هر کلمه از بسامد آن در `words.dat` به دست می‌آید و صورت‌های صرفی
+        افعال احتمال کلمه‌ای با بسامد صفر را دارند که مقدار رشتهٔ خالی است. مقدار
+        پیشوندهایی که خودشان کلمه نیستند `None` است؛ پس پیمایش حروف یک توکن از
+        هر نقطه، همین که به رشته‌ای برسد که در این جدول نیست، متوقف می‌شود. این
+        جدول در اولین استفاده ساخته می‌شود و بین همهٔ نمونه‌ها مشترک است.
+        
+        """
+        if self._prefixes is None:
+            self._prefixes = shared_lexicon(
+                "splitter prefixes",
+                [default_words, default_verbs],
+                self.load_prefixes,
+            )
+        return self._prefixes
+
+    def load_prefixes(self):
+        prefixes = {}
+        words = list(self.lemmatizer.verbs) + list(self.words)
+        for word in words:
+            for end in range(1, len(word)):
+                prefixes.setdefault(word[:end], None)
+
+        total = log(sum(count + 1 for count, tags in self.words.values()))
+        prefixes[""] = -total
+        for verb in self.lemmatizer.verbs:
+            prefixes[verb] = -total
+        for word, (count, tags) in self.words.items():
+            prefixes[word] = log(count + 1) - total
+        return prefixes
 
     def split_token_words(self, token):
         """توکنِ ورودی را به دو توکن کوچکتر تجزیه می‌کند.
@@ -57,14 +97,92 @@ class TokenSplitter:
             if token[s - 1] != "‌" and token[s] != "‌"
         ] + [(token,)]
         candidates.extend(
-            list(
-                filter(
-                    lambda tokens: set(map(self.lemmatize, tokens)).issubset(
-                        self.words
-                    ),
-                    splits,
-                )
-            )
+            tokens
+            for tokens in splits
+            if all(self.lemmatize(part) in self.words for part in tokens)
         )
 
         return candidates
+
+    def segment_token_words(self, token):
+        """محتمل‌ترین تجزیهٔ توکن به یک یا چند کلمه را برمی‌گرداند.
+        
+        از هر نقطهٔ توکن، کلماتی که از آن نقطه شروع می‌شوند با یک پیمایش جدول
+        [prefixes][hazm.TokenSplitter.TokenSplitter.prefixes] پیدا می‌شوند.
+        صورت‌های دارای پسوند هر کلمه (مثل «موشها») نیز با احتمال خود کلمه و
+        جریمهٔ `suffix_score` برای هر حرف پسوند در نظر گرفته می‌شوند. سپس از
+        میان تجزیه‌هایی که بیشترین تعداد حروف توکن را پوشش می‌دهند، محتمل‌ترین
+        آن‌ها انتخاب می‌شود. بخش‌هایی از توکن که کلمه‌ای برایشان پیدا نشود بدون
+        تغییر برگردانده می‌شوند. توکن از کنار نیم‌فاصله شکسته نمی‌شود و اگر
+        تجزیه‌ای پیدا نشود خود توکن برگردانده می‌شود.
+        
+        Examples:
+            >>> splitter = TokenSplitter()
+            >>> splitter.segment_token_words('شهرموشها')
+            ('شهر', 'موشها')
+            >>> splitter.segment_token_words('کتابخانهٔملیایران')
+            ('کتابخانهٔ', 'ملی', 'ایران')
+            >>> splitter.segment_token_words('دانشجویانکتاب‌هایشانراآوردند')
+            ('دانشجویان', 'کتاب‌هایشان', 'را', 'آوردند')
+            >>> splitter.segment_token_words('Hazmرابخوانید')
+            ('Hazm', 'را', 'بخوانید')
+        
+        Args:
+            token (str): توکنی که باید پردازش شود.
+        
+        Returns:
+            (Tuple[str]): کلمات توکن به ترتیب.
+        
+        """
+        prefixes, stem = self.prefixes, self.lemmatizer.stemmer.stem
+        n = len(token)
+        ends = [
+            s == n or (token[s - 1] != "‌" and token[s] != "‌") for s in range(n + 1)
+        ]
+
+        # best[s] holds the number of letters covered by words, the score and
+        # the end of the first part of the best segmentation of token[s:]
+        best = [None] * (n + 1)
+        best[n] = (0, 0.0, n)
+        for start in reversed(range(n)):
+            if start and not ends[start]:
+                continue
+            candidates = []
+
+            # parts that are not words never hold a zero width non-joiner
+            for stop in range(start + 1, n + 1):
+                if token[stop - 1] == "‌":
+                    break
+                if ends[stop] and best[stop]:
+                    covered, score = best[stop][:2]
+                    candidates.append((covered, prefixes[""] + score, stop))
+
+            for end in range(start + 1, n + 1):
+                word = token[start:end]
+                if word not in prefixes:
+                    break
+                if prefixes[word] is None:
+                    continue
+                # inflected forms of the word, the longest chain of suffixes
+                # the stemmer strips is shorter than max_suffix letters
+                for stop in range(end, min(n, end + self.max_suffix) + 1):
+                    if (
+                        ends[stop]
+                        and best[stop]
+                        and (stop == end or stem(token[start:stop]) == word)
+                    ):
+                        covered, score = best[stop][:2]
+                        score += prefixes[word] + (stop - end) * self.suffix_score
+                        candidates.append((covered + stop - start, score, stop))
+
+            if candidates:
+                best[start] = max(candidates)
+
+        if not n or best[0] is None:
+            return (token,)
+
+        words, start = [], 0
+        while start < n:
+            words.append(token[start : best[start][2]])
+            start = best[start][2]
+        return tuple(words)
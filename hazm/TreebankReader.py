@@ -189,15 +189,17 @@ class TreebankReader:
                 and type(tree[1]) == Tree
                 and type(tree[0]) == Tree
                 and tree[0].label() == "AUX"
-                and tree[0][0][0] in self._tokenizer.before_verbs
+                and tree[0][0][0] in self._tokenizer.verb_parts.before_verbs
             ):
                 tree[1][0] = (tree[0][0][0] + " " + tree[1][0][0], tree[1][0][1])
                 tree.remove(tree[0])
             if (
                 self._join_verb_parts
                 and len(tree.leaves()) > 1
-                and tree.leaves()[-1][0] in self._tokenizer.after_verbs
-                and tree.leaves()[-2][0] in self._tokenizer.verbe
+                and tree.leaves()[-2][0] in self._tokenizer.verb_parts.verbe
+                and self._tokenizer.verb_parts.joins(
+                    tree.leaves()[-2][0], [tree.leaves()[-1][0]]
+                )
             ):
                 tree[1][0] = (
                     tree[0].leaves()[-1][0] + " " + tree[1][0][0],
@@ -212,8 +214,10 @@ class TreebankReader:
             if (
                 self._join_verb_parts
                 and len(tree.leaves()) > 1
-                and tree.leaves()[-1][0] in self._tokenizer.after_verbs
-                and tree.leaves()[-2][0] in self._tokenizer.verbe
+                and tree.leaves()[-2][0] in self._tokenizer.verb_parts.verbe
+                and self._tokenizer.verb_parts.joins(
+                    tree.leaves()[-2][0], [tree.leaves()[-1][0]]
+                )
             ):
                 tree[1][0] = (
                     tree[0].leaves()[-1][0] + " " + tree[1][0][0],
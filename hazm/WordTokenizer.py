@@ -9,11 +9,146 @@
 
 from __future__ import unicode_literals
 import re
-import codecs
-from .utils import words_list, default_words, default_verbs
+from operator import itemgetter
+from .utils import (
+    words_list,
+    read_lines,
+    default_words,
+    default_verbs,
+    shared_lexicon,
+    load_lexicon,
+)
 from nltk.tokenize.api import TokenizerI
 
 
+class CompoundVerbMatcher(object):
+    """این کلاس بخش‌های افعال چندبخشی را در دنباله‌ای از کلمات پیدا می‌کند.
+    
+    فهرست افعال کمکی پسین (مثل «است» یا «شده_بود») به یک ماشین حالت متناهی
+    تبدیل می‌شود که کلمات را از انتهای فعل می‌خواند. کلماتی که نه فعل کمکی
+    پیشین‌اند و نه صفت مفعولی، مرز قطعی گروه‌ها هستند؛ پس ورودی در یک گذر از
+    ابتدا خوانده می‌شود و هر گروه به محض قطعی شدن برگردانده می‌شود.
+    
+    Examples:
+        >>> matcher = WordTokenizer().verb_parts
+        >>> list(matcher.groups(['گفته', 'شده', 'است', '.']))
+        [['گفته', 'شده', 'است'], ['.']]
+    
+    Args:
+        before_verbs (Iterable[str]): افعال کمکی‌ای که پیش از فعل اصلی می‌آیند؛ مثل «خواهد».
+        after_verbs (Iterable[str]): افعال کمکی‌ای که پس از صفت مفعولی می‌آیند؛ بخش‌های هر کدام با _ از هم جدا شده‌اند.
+        verbe (Iterable[str]): صفت‌های مفعولی؛ مثل «گفته» یا «نگفته».
+    
+    """
+
+    def __init__(self, before_verbs, after_verbs, verbe):
+        self.before_verbs = set(before_verbs)
+        self.after_verbs = set(after_verbs)
+        self.verbe = set(verbe)
+        self.parts = self.before_verbs | self.verbe
+
+        # state 0 is the start state, other states are created on demand
+        self.transitions, self.accepting = {}, set()
+        for verb in self.after_verbs:
+            state = 0
+            for part in reversed(verb.split("_")):
+                if (state, part) not in self.transitions:
+                    self.transitions[(state, part)] = len(self.transitions) + 1
+                state = self.transitions[(state, part)]
+            self.accepting.add(state)
+
+    def read(self, state, word):
+        """ماشین را از حالت داده‌شده با خواندن بخش‌های کلمه از انتها جلو می‌برد.
+        
+        Args:
+            state (int): حالت فعلی ماشین؛ `None` یعنی هیچ فعل کمکی‌ای ممکن نیست.
+            word (str): کلمه‌ای که به ابتدای گروه اضافه می‌شود.
+        
+        Returns:
+            (int): حالت بعدی ماشین.
+        
+        """
+        for part in reversed(word.split("_")):
+            if state is None:
+                break
+            state = self.transitions.get((state, part))
+        return state
+
+    def joins(self, word, following):
+        """مشخص می‌کند که آیا کلمه به کلماتِ بعد از خود می‌چسبد یا نه.
+        
+        Examples:
+            >>> matcher = WordTokenizer().verb_parts
+            >>> matcher.joins('گفته', ['شده', 'است'])
+            True
+            >>> matcher.joins('خسته', ['شدید'])
+            False
+        
+        Args:
+            word (str): کلمه.
+            following (List[str]): کلمات گروهی که بلافاصله بعد از کلمه آمده است.
+        
+        Returns:
+            (bool): اگر کلمه جزئی از همان فعل باشد `True` و در غیر این صورت `False`.
+        
+        """
+        state = 0
+        for other in reversed(following):
+            state = self.read(state, other)
+        return word in self.before_verbs or (
+            state in self.accepting and word in self.verbe
+        )
+
+    def groups(self, items, key=None):
+        """عناصر ورودی را به گروه‌هایی تقسیم می‌کند که هر کدام یک توکن می‌شوند.
+        
+        Examples:
+            >>> matcher = WordTokenizer().verb_parts
+            >>> list(matcher.groups([('دیده', 'AJ'), ('شد', 'V')], key=lambda item: item[0]))
+            [[('دیده', 'AJ'), ('شد', 'V')]]
+        
+        Args:
+            items (Iterable[Any]): کلمات یا عناصری مثل `(توکن، برچسب)` و `(توکن، محدوده)`.
+            key (Callable, optional): تابعی که کلمهٔ هر عنصر را برمی‌گرداند.
+        
+        Yields:
+            (List[Any]): عناصر متوالی‌ای که با هم یک فعل یا یک کلمه را می‌سازند.
+        
+        """
+        pending = []
+        for item in items:
+            if (key(item) if key else item) in self.parts:
+                pending.append(item)
+            elif pending:
+                # this word can not join the next one, so the pending words are final
+                pending.append(item)
+                for group in self.split(pending, key):
+                    yield group
+                pending = []
+            else:
+                yield [item]
+        for group in self.split(pending, key):
+            yield group
+
+    def split(self, items, key=None):
+        groups, state = [], None
+        for item in reversed(items):
+            word = key(item) if key else item
+            if groups and (
+                word in self.before_verbs
+                or (state in self.accepting and word in self.verbe)
+            ):
+                groups[-1].append(item)
+            else:
+                groups.append([item])
+                state = 0
+            state = self.read(state, word)
+
+        for group in reversed(groups):
+            group.reverse()
+        return reversed(groups)
+
+
 class WordTokenizer(TokenizerI):
     """این کلاس شامل توابعی برای استخراج کلماتِ متن است.
     
@@ -59,6 +194,17 @@ class WordTokenizer(TokenizerI):
         self.pattern = re.compile(
             r'([؟!\?]+|\d[\d\.:\/\\]+\d|[:\.،؛»\]\)\}"«\[\(\{])'
         )  # TODO \d
+        # a token is either a match of `pattern` or a run of characters that can not
+        # start one, so one findall splits text the same way as padding matches of
+        # `pattern` with spaces and splitting on whitespace
+        char = r'[^ \n\t؟!\?:\.،؛»\]\)\}"«\[\(\{\d]'
+        digit = r"\d(?![\d\.:\/\\]+\d)"
+        self.token_pattern = re.compile(
+            "{char}+(?:{digit}{char}*)*|{digit}(?:{char}|{digit})*|".format(
+                char=char, digit=digit
+            )
+            + self.pattern.pattern[1:-1]
+        )
         self.emoji_pattern = re.compile(
             "["
             "\U0001F600-\U0001F64F"  # emoticons
@@ -83,7 +229,6 @@ class WordTokenizer(TokenizerI):
         self.number_int_pattern = re.compile(
             r"\b(?<![\d۰-۹][\.٫٬,])([\d۰-۹]+)(?![\.٫٬,][\d۰-۹])\b"
         )
-        self.number_int_repl = lambda m: " NUM" + str(len(m.group(1))) + " "
         self.number_float_pattern = re.compile(
             r"\b(?<!\.)([\d۰-۹,٬]+[\.٫٬]{1}[\d۰-۹]+)\b(?!\.)"
         )
@@ -92,9 +237,17 @@ class WordTokenizer(TokenizerI):
         self.hashtag_pattern = re.compile(r"\#([\S]+)")
         # NOTE: python2.7 does not support unicodes with \w
 
-        self.hashtag_repl = lambda m: "TAG " + m.group(1).replace("_", " ")
-
-        self.words = {item[0]: (item[1], item[2]) for item in words_list(words_file)}
+        # the mapped lexicon is shared by all processes, the dict is the
+        # fallback for other words files and for an out of date lexicon
+        self.words = words_file == default_words and load_lexicon()
+        if not self.words:
+            self.words = shared_lexicon(
+                "words",
+                [words_file],
+                lambda: {
+                    item[0]: (item[1], item[2]) for item in words_list(words_file)
+                },
+            )
 
         if join_verb_parts:
             self.after_verbs = set(
@@ -233,15 +386,29 @@ class WordTokenizer(TokenizerI):
                 ]
             )
 
-            with codecs.open(verbs_file, encoding="utf8") as verbs_file:
-                self.verbs = list(
-                    reversed([verb.strip() for verb in verbs_file if verb])
-                )
-                self.bons = set([verb.split("#")[0] for verb in self.verbs])
-                self.verbe = set(
-                    [bon + "ه" for bon in self.bons]
-                    + ["ن" + bon + "ه" for bon in self.bons]
-                )
+            self.verbs, self.bons, self.verbe = shared_lexicon(
+                "verbs", [verbs_file], lambda: self.load_verbs(verbs_file)
+            )
+            self.verb_parts = shared_lexicon(
+                "verb_parts",
+                [verbs_file],
+                lambda: CompoundVerbMatcher(
+                    self.before_verbs, self.after_verbs, self.verbe
+                ),
+            )
+
+    def number_int_repl(self, match):
+        return " NUM" + str(len(match.group(1))) + " "
+
+    def hashtag_repl(self, match):
+        return "TAG " + match.group(1).replace("_", " ")
+
+    @staticmethod
+    def load_verbs(verbs_file):
+        verbs = list(reversed(read_lines(verbs_file)))
+        bons = set([verb.split("#")[0] for verb in verbs])
+        verbe = set([bon + "ه" for bon in bons] + ["ن" + bon + "ه" for bon in bons])
+        return verbs, bons, verbe
 
     def tokenize(self, text):
         """توکن‌های متن را استخراج می‌کند.
@@ -276,26 +443,106 @@ class WordTokenizer(TokenizerI):
         
         """
 
+        for pattern, repl in self.replacements(text):
+            text = pattern.sub(repl, text)
+
+        tokens = self.token_pattern.findall(text)
+        if self._join_verb_parts:
+            tokens = self.join_verb_parts(tokens)
+        return tokens
+
+    def replacements(self, text):
+        """الگوها و جایگزین‌هایی را که باید به ترتیب روی متن اعمال شوند برمی‌گرداند.
+        
+        Args:
+            text (str): متن ورودی؛ قواعدی که در این متن موردی ندارند حذف می‌شوند.
+        
+        Returns:
+            (List[Tuple[Pattern,str]]): الگوها و جایگزین‌ها.
+        
+        """
+        rules = []
         if self.separate_emoji:
-            text = self.emoji_pattern.sub(self.emoji_repl, text)
-        if self.replace_emails:
-            text = self.email_pattern.sub(self.email_repl, text)
+            rules.append((self.emoji_pattern, self.emoji_repl))
+        if self.replace_emails and "@" in text:
+            rules.append((self.email_pattern, self.email_repl))
         if self.replace_links:
-            text = self.link_pattern.sub(self.link_repl, text)
-        if self.replace_IDs:
-            text = self.id_pattern.sub(self.id_repl, text)
-        if self.replace_hashtags:
-            text = self.hashtag_pattern.sub(self.hashtag_repl, text)
+            rules.append((self.link_pattern, self.link_repl))
+        if self.replace_IDs and "@" in text:
+            rules.append((self.id_pattern, self.id_repl))
+        if self.replace_hashtags and "#" in text:
+            rules.append((self.hashtag_pattern, self.hashtag_repl))
         if self.replace_numbers:
-            text = self.number_int_pattern.sub(self.number_int_repl, text)
-            text = self.number_float_pattern.sub(self.number_float_repl, text)
+            rules.append((self.number_int_pattern, self.number_int_repl))
+            rules.append((self.number_float_pattern, self.number_float_repl))
+        return rules
+
+    def span_tokenize(self, text):
+        """محدودهٔ توکن‌های متن را به صورت جفت‌های `(شروع، پایان)` برمی‌گرداند.
+        
+        توکن‌ها همان خروجی [tokenize()][hazm.WordTokenizer.WordTokenizer.tokenize]
+        هستند. هر جایگزین (مثل `LINK` یا `NUM2`) به محدودهٔ متنی که جایگزینش
+        شده و هر فعل چندبخشی به محدودهٔ همهٔ بخش‌هایش اشاره می‌کند.
+        
+        Examples:
+            >>> tokenizer = WordTokenizer()
+            >>> text = 'این کتاب خوانده شده است.'
+            >>> [text[start:end] for start, end in tokenizer.span_tokenize(text)]
+            ['این', 'کتاب', 'خوانده شده است', '.']
+            >>> tokenizer = WordTokenizer(join_verb_parts=False, replace_links=True, replace_numbers=True)
+            >>> text = 'نسخهٔ 2 در https://t.co/tZOurPSXzi'
+            >>> list(zip(tokenizer.tokenize(text), tokenizer.span_tokenize(text)))
+            [('نسخهٔ', (0, 5)), ('NUM1', (6, 7)), ('در', (8, 10)), ('LINK', (11, 34))]
+        
+        Args:
+            text (str): متنی که باید توکن‌های آن استخراج شود.
+        
+        Yields:
+            (Tuple[int,int]): محدودهٔ توکن بعدی در متن ورودی.
+        
+        """
+        rules = self.replacements(text)
+        if rules:
+            # starts[i] and ends[i] locate the i-th character of the rewritten text in
+            # the input, replacements take the range of the text they replace
+            starts, ends = list(range(len(text))), list(range(1, len(text) + 1))
+        for pattern, repl in rules:
+            parts, new_starts, new_ends, last = [], [], [], 0
+            for match in pattern.finditer(text):
+                start, end = match.span()
+                replacement = repl(match) if callable(repl) else match.expand(repl)
+                parts.extend([text[last:start], replacement])
+                new_starts.extend(starts[last:start])
+                new_ends.extend(ends[last:start])
+                tag = len(replacement) - (end - start - 1)
+                if pattern is self.hashtag_pattern and tag >= 0:
+                    # the words of a hashtag keep their own ranges
+                    new_starts.extend([starts[start]] * tag + starts[start + 1 : end])
+                    new_ends.extend([ends[start]] * tag + ends[start + 1 : end])
+                else:
+                    new_starts.extend([starts[start]] * len(replacement))
+                    new_ends.extend([ends[end - 1]] * len(replacement))
+                last = end
+            parts.append(text[last:])
+            text = "".join(parts)
+            starts = new_starts + starts[last:]
+            ends = new_ends + ends[last:]
 
-        text = self.pattern.sub(r" \1 ", text.replace("\n", " ").replace("\t", " "))
+        tokens, spans = [], []
+        for match in self.token_pattern.finditer(text):
+            start, end = match.span()
+            tokens.append(match.group())
+            spans.append((starts[start], ends[end - 1]) if rules else (start, end))
 
-        tokens = [word for word in text.split(" ") if word]
         if self._join_verb_parts:
-            tokens = self.join_verb_parts(tokens)
-        return tokens
+            spans = [
+                (group[0][1][0], group[-1][1][1])
+                for group in self.verb_parts.groups(
+                    zip(tokens, spans), key=itemgetter(0)
+                )
+            ]
+
+        return iter(spans)
 
     def join_verb_parts(self, tokens):
         """افعال چندبخشی را به هم می‌چسباند.
@@ -312,6 +559,8 @@ class WordTokenizer(TokenizerI):
             ['گفته_خواهد_شد']
             >>> tokenizer.join_verb_parts(['خسته', 'شدید'])
             ['خسته', 'شدید']
+            >>> tokenizer.join_verb_parts(['او', 'خواهد'])
+            ['او', 'خواهد']
         
         Args:
             tokens (List[str]): لیست کلمات یک فعل چندبخشی.
@@ -321,15 +570,4 @@ class WordTokenizer(TokenizerI):
         
         """
 
-        if len(tokens) == 1:
-            return tokens
-
-        result = [""]
-        for token in reversed(tokens):
-            if token in self.before_verbs or (
-                result[-1] in self.after_verbs and token in self.verbe
-            ):
-                result[-1] = token + "_" + result[-1]
-            else:
-                result.append(token)
-        return list(reversed(result[1:]))
+        return ["_".join(group) for group in self.verb_parts.groups(tokens)]
@@ -1,39 +1,98 @@
-from .WordTokenizer import WordTokenizer
-from .SentenceTokenizer import SentenceTokenizer
-from .TokenSplitter import TokenSplitter
-from .HamshahriReader import HamshahriReader
-from .PersicaReader import PersicaReader
-from .BijankhanReader import BijankhanReader
-from .PeykareReader import PeykareReader
-from .VerbValencyReader import VerbValencyReader
-from .DadeganReader import DadeganReader
-from .TreebankReader import TreebankReader
-from .WikipediaReader import WikipediaReader
-from .SentiPersReader import SentiPersReader
-from .DegarbayanReader import DegarbayanReader
-from .QuranCorpusReader import QuranCorpusReader
-from .TNewsReader import TNewsReader
-from .MirasTextReader import MirasTextReader
-from .Normalizer import Normalizer
-from .InformalNormalizer import InformalNormalizer, InformalLemmatizer
-from .Stemmer import Stemmer
-from .Lemmatizer import Lemmatizer
-from .SequenceTagger import SequenceTagger, IOBTagger
-from .POSTagger import POSTagger, StanfordPOSTagger
-from .Chunker import Chunker, RuleBasedChunker, tree2brackets
-from .DependencyParser import DependencyParser, MaltParser, TurboParser
-
+import sys
+from importlib import import_module
+from types import ModuleType
 
+from . import utils
 from .utils import words_list, stopwords_list
 
 
+# submodules are imported on first use of their classes, so `import hazm` does
+# not pay for the readers, taggers and parsers (and nltk) until they are needed
+_attributes = {
+    "WordTokenizer": "WordTokenizer",
+    "SentenceTokenizer": "SentenceTokenizer",
+    "TokenSplitter": "TokenSplitter",
+    "HamshahriReader": "HamshahriReader",
+    "PersicaReader": "PersicaReader",
+    "BijankhanReader": "BijankhanReader",
+    "PeykareReader": "PeykareReader",
+    "VerbValencyReader": "VerbValencyReader",
+    "DadeganReader": "DadeganReader",
+    "TreebankReader": "TreebankReader",
+    "WikipediaReader": "WikipediaReader",
+    "SentiPersReader": "SentiPersReader",
+    "DegarbayanReader": "DegarbayanReader",
+    "QuranCorpusReader": "QuranCorpusReader",
+    "TNewsReader": "TNewsReader",
+    "MirasTextReader": "MirasTextReader",
+    "Normalizer": "Normalizer",
+    "InformalNormalizer": "InformalNormalizer",
+    "InformalLemmatizer": "InformalNormalizer",
+    "Stemmer": "Stemmer",
+    "Lemmatizer": "Lemmatizer",
+    "SequenceTagger": "SequenceTagger",
+    "IOBTagger": "SequenceTagger",
+    "TaggerPool": "SequenceTagger",
+    "POSTagger": "POSTagger",
+    "StanfordPOSTagger": "POSTagger",
+    "Chunker": "Chunker",
+    "RuleBasedChunker": "Chunker",
+    "tree2brackets": "Chunker",
+    "DependencyParser": "DependencyParser",
+    "MaltParser": "DependencyParser",
+    "TurboParser": "DependencyParser",
+    "Pipeline": "Pipeline",
+}
+
+__all__ = list(_attributes) + [
+    "utils",
+    "words_list",
+    "stopwords_list",
+    "sent_tokenize",
+    "word_tokenize",
+]
+
+
+def __getattr__(name):
+    if name not in _attributes:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(import_module("." + _attributes[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_attributes))
+
+
+class _Package(ModuleType):
+    def __setattr__(self, name, value):
+        # importing a submodule binds it on the package; most of them share the
+        # name of their main class, which must stay reachable as `hazm.<name>`
+        if name in _attributes and isinstance(value, ModuleType):
+            return
+        ModuleType.__setattr__(self, name, value)
+
+
+if sys.version_info >= (3, 7):
+    sys.modules[__name__].__class__ = _Package
+else:
+    # module level __getattr__ (PEP 562) is not available, import everything
+    for _name in _attributes:
+        __getattr__(_name)
+
+
 def sent_tokenize(text):
     if not hasattr(sent_tokenize, "tokenizer"):
+        from .SentenceTokenizer import SentenceTokenizer
+
         sent_tokenize.tokenizer = SentenceTokenizer()
     return sent_tokenize.tokenizer.tokenize(text)
 
 
 def word_tokenize(sentence):
     if not hasattr(word_tokenize, "tokenizer"):
+        from .WordTokenizer import WordTokenizer
+
         word_tokenize.tokenizer = WordTokenizer()
     return word_tokenize.tokenizer.tokenize(sentence)
@@ -0,0 +1,40 @@
+import java.io.BufferedReader;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import org.maltparser.MaltParserService;
+
+/**
+ * Keeps a MaltParser model loaded and parses sentences read from stdin.
+ *
+ * Each request is a line with the number of tokens followed by one CoNLL line per
+ * token; the response has the same framing. Usage: MaltServer model_name, run in
+ * the working directory of the model.
+ */
+public class MaltServer {
+    public static void main(String[] args) throws Exception {
+        PrintStream out = new PrintStream(new FileOutputStream(FileDescriptor.out), false, "UTF-8");
+        // MaltParser may log to stdout, which is reserved for responses
+        System.setOut(System.err);
+
+        MaltParserService service = new MaltParserService();
+        service.initializeParserModel("-c " + args[0] + " -m parse -w . -lfi parser.log");
+
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in, "UTF-8"));
+        String line;
+        while ((line = in.readLine()) != null) {
+            String[] tokens = new String[Integer.parseInt(line.trim())];
+            for (int i = 0; i < tokens.length; i++) {
+                tokens[i] = in.readLine();
+            }
+            String[] parsed = tokens.length > 0 ? service.parseTokens(tokens) : tokens;
+            out.println(parsed.length);
+            for (String token : parsed) {
+                out.println(token);
+            }
+            out.flush();
+        }
+        service.terminateParserModel();
+    }
+}
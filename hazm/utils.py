@@ -5,7 +5,12 @@
 """
 
 import re
-import sys, codecs
+import sys, codecs, json, mmap, struct, zlib
+from array import array
+from collections import deque
+from collections.abc import Mapping
+from itertools import islice
+from multiprocessing import Pool
 from os import path
 
 PY2 = sys.version_info[0] == 2
@@ -16,13 +21,329 @@ default_stopwords = path.join(data_path, "stopwords.dat")
 default_verbs = path.join(data_path, "verbs.dat")
 informal_words = path.join(data_path, "iwords.dat")
 informal_verbs = path.join(data_path, "iverbs.dat")
+default_lexicon = path.join(data_path, "lexicon.bin")
+lexicon_sources = [
+    default_words,
+    default_verbs,
+    informal_words,
+    informal_verbs,
+    default_stopwords,
+]
+lexicon_magic = b"HAZMLEX2"
 
 NUMBERS = "۰۱۲۳۴۵۶۷۸۹"
 
 maketrans = lambda A, B: dict((ord(a), b) for a, b in zip(A, B))
 
+lexicons = {}
+
+
+def shared_lexicon(name, files, load):
+    """ساختار دادهٔ حاصل از خواندن فایل‌های داده را یک بار در هر پردازه می‌سازد و
+    همان نمونه را به همهٔ اجزا برمی‌گرداند.
+    
+    ساختارها با نام و مسیر فایل‌ها شناخته می‌شوند و اگر زمان آخرین تغییر یکی از
+    فایل‌ها عوض شود دوباره ساخته می‌شوند. خروجی این تابع میان اجزای مختلف
+    مشترک است؛ پس آن را تغییر ندهید و اگر لازم شد نسخه‌ای از آن بسازید.
+    
+    Examples:
+        >>> words = shared_lexicon('doctest words', [default_words], lambda: words_list())
+        >>> words is shared_lexicon('doctest words', [default_words], lambda: words_list())
+        True
+    
+    Args:
+        name (Hashable): نام ساختار؛ ساختارهایی که از فایل‌های یکسان ساخته می‌شوند اما شکل متفاوتی دارند باید نام متفاوتی داشته باشند.
+        files (List[str]): مسیر فایل‌هایی که ساختار از روی آن‌ها ساخته می‌شود.
+        load (Callable): تابعی بدون ورودی که ساختار را می‌سازد.
+    
+    Returns:
+        (Any): ساختار ساخته‌شده.
+    
+    """
+    key = (name,) + tuple(path.abspath(file) for file in files)
+    stamp = tuple(path.getmtime(file) for file in files)
+    if key not in lexicons or lexicons[key][0] != stamp:
+        lexicons[key] = (stamp, load())
+    return lexicons[key][1]
+
+
+def imap_chunks(function, items, workers, chunksize, initializer=None, initargs=()):
+    """دسته‌های `chunksize`تایی از ورودی را در چند پردازه پردازش می‌کند.
+    
+    نتایج به همان ترتیب ورودی برگردانده می‌شوند و حداکثر دو دسته برای هر
+    پردازه در صف می‌ماند؛ بنابراین ورودی می‌تواند هر `Iterator`ی با طول
+    نامحدود باشد.
+    
+    Examples:
+        >>> list(imap_chunks(sorted, [3, 1, 2], workers=2, chunksize=2))
+        [1, 3, 2]
+    
+    Args:
+        function (Callable): تابعی که لیست یک دسته را می‌گیرد و لیست نتایج آن را برمی‌گرداند.
+        items (Iterable): ورودی‌ها.
+        workers (int): تعداد پردازه‌ها.
+        chunksize (int): تعداد ورودی‌هایی که در هر نوبت به یک پردازه سپرده می‌شود.
+        initializer (Callable, optional): تابعی که در شروع کار هر پردازه با `initargs` فراخوانی می‌شود.
+        initargs (Tuple, optional): ورودی‌های `initializer`.
+    
+    Yields:
+        (Any): نتیجهٔ بعدی.
+    
+    """
+    pool = Pool(workers, initializer=initializer, initargs=initargs)
+    try:
+        items = iter(items)
+        pending = deque()
+        max_pending = 2 * workers
+        while True:
+            chunk = list(islice(items, chunksize))
+            if chunk:
+                pending.append(pool.apply_async(function, (chunk,)))
+            if pending and (len(pending) >= max_pending or not chunk):
+                for result in pending.popleft().get():
+                    yield result
+            elif not chunk:
+                break
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+class Lexicon(Mapping):
+    """نسخهٔ دودوییِ فایل‌های دادهٔ هضم را از طریق نگاشت حافظه (mmap) می‌خواند.
+    
+    این فایل با [build_lexicon()][hazm.utils.build_lexicon] ساخته می‌شود و شامل
+    جدول مرتب‌شدهٔ کلمات به همراه بسامد و شناسهٔ برچسب‌ها، جدول درهم‌سازی
+    کلمات و خطوطِ فایل‌های دیگر است؛ بنابراین برای بارگذاری، نیازی به شکستن
+    خطوط و تبدیل اعداد نیست و پردازه‌هایی که از یک پردازهٔ مادر منشعب می‌شوند
+    صفحه‌های این فایل را به اشتراک می‌گذارند. جست‌وجوی کلمات مستقیماً روی همین
+    صفحه‌ها انجام می‌شود.
+    
+    Examples:
+        >>> lexicon = load_lexicon()
+        >>> lexicon['آب']
+        (549005877, ('N', 'AJ'))
+        >>> 'آبب' in lexicon
+        False
+    
+    Args:
+        lexicon_file (str, optional): مسیر فایل دودویی.
+    
+    Raises:
+        ValueError: اگر فایل معتبر نباشد یا با فایل‌های دادهٔ فعلی هم‌خوانی نداشته باشد.
+    
+    """
+
+    def __init__(self, lexicon_file=default_lexicon):
+        self.lexicon_file = lexicon_file
+        with open(lexicon_file, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.buffer[: len(lexicon_magic)] != lexicon_magic:
+            raise ValueError("%s is not a lexicon file" % lexicon_file)
+        size = struct.unpack_from("<I", self.buffer, len(lexicon_magic))[0]
+        start = len(lexicon_magic) + 4
+        header = json.loads(self.buffer[start : start + size].decode("utf8"))
+        self.start = start + size + (-(start + size) % 8)
+        for name, checksum in header["sources"].items():
+            if file_checksum(path.join(data_path, name)) != checksum:
+                raise ValueError("%s is out of date" % lexicon_file)
+        self.blocks = header["blocks"]
+
+        self.key_start = self.start + self.blocks["words.keys"][0]
+        self.offsets = self.array("words.offsets", "I")
+        self.freqs = self.array("words.freqs", "q")
+        self.tags = self.array("words.tags", "H")
+        self.index = self.array("words.index", "I")
+        self.slots = self.array("words.slots", "I")
+        self.tagsets = [
+            tuple(tags.split(",")) for tags in self.text("words.tagsets").split("\n")
+        ]
+
+    def block(self, name):
+        offset, length = self.blocks[name]
+        offset += self.start
+        return memoryview(self.buffer)[offset : offset + length]
+
+    def text(self, name):
+        return self.block(name).tobytes().decode("utf8")
+
+    def array(self, name, typecode):
+        if sys.byteorder == "little":
+            return self.block(name).cast(typecode)
+        values = array(typecode, self.block(name).tobytes())
+        values.byteswap()
+        return values
+
+    def key(self, entry):
+        start, end = self.offsets[entry], self.offsets[entry + 1] - 1
+        return self.buffer[self.key_start + start : self.key_start + end]
+
+    def entry(self, word):
+        key, slots = word.encode("utf8"), self.slots
+        mask = len(slots) - 1
+        slot = zlib.crc32(key) & mask
+        while slots[slot]:
+            if self.key(slots[slot] - 1) == key:
+                return slots[slot] - 1
+            slot = (slot + 1) & mask
+        return -1
+
+    def __getitem__(self, word):
+        entry = self.entry(word)
+        if entry < 0:
+            raise KeyError(word)
+        return self.freqs[entry], self.tagsets[self.tags[entry]]
+
+    def __contains__(self, word):
+        return self.entry(word) >= 0
+
+    def __iter__(self):
+        for entry in self.index:
+            yield self.key(entry).decode("utf8")
+
+    def __len__(self):
+        return len(self.index)
+
+    def __reduce__(self):
+        return load_lexicon, (self.lexicon_file,)
+
+    def values(self):
+        for entry in self.index:
+            yield self.freqs[entry], self.tagsets[self.tags[entry]]
+
+    def items(self):
+        for entry in self.index:
+            word = self.key(entry).decode("utf8")
+            yield word, (self.freqs[entry], self.tagsets[self.tags[entry]])
+
+    def words_list(self):
+        """همان خروجی [words_list()][hazm.utils.words_list] را برمی‌گرداند."""
+        words = self.text("words.keys").split("\n")[:-1]
+        tags = map(self.tagsets.__getitem__, self.tags)
+        return list(zip(words, self.freqs.tolist(), tags))
+
+    def lines(self, data_file):
+        """خطوط یکی از فایل‌های داده را بدون فاصله‌های ابتدا و انتها برمی‌گرداند."""
+        return self.text(path.basename(data_file)).split("\n")
+
+
+def file_checksum(data_file):
+    with open(data_file, "rb") as file:
+        return zlib.crc32(file.read()) & 0xFFFFFFFF
+
+
+def build_lexicon(lexicon_file=default_lexicon):
+    """فایل دودوییِ [Lexicon][hazm.utils.Lexicon] را از روی فایل‌های دادهٔ
+    هضم می‌سازد.
+    
+    پس از هر تغییر در این فایل‌ها باید دوباره ساخته شود؛ تا آن زمان، هضم
+    فایل‌های متنی را مستقیماً می‌خواند.
+    
+    Args:
+        lexicon_file (str, optional): مسیر فایل خروجی.
+    
+    """
+    words = list(words_list(default_words, lexicon=False))
+    tagsets = sorted(set(",".join(tags) for word, count, tags in words))
+    tag_ids = {tags: i for i, tags in enumerate(tagsets)}
+
+    keys = [word.encode("utf8") + b"\n" for word, count, tags in words]
+    offsets = [0]
+    for key in keys:
+        offsets.append(offsets[-1] + len(key))
+    last = {key: entry for entry, key in enumerate(keys)}
+
+    # open addressing on crc32 of the keys, zero marks an empty slot
+    slots = array("I", [0]) * (1 << (2 * len(last)).bit_length())
+    for key, entry in last.items():
+        slot = zlib.crc32(key[:-1]) & (len(slots) - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (len(slots) - 1)
+        slots[slot] = entry + 1
+
+    blocks = [
+        ("words.keys", b"".join(keys)),
+        ("words.offsets", array("I", offsets)),
+        ("words.freqs", array("q", [count for word, count, tags in words])),
+        ("words.tags", array("H", [tag_ids[",".join(item[2])] for item in words])),
+        ("words.tagsets", "\n".join(tagsets).encode("utf8")),
+        ("words.index", array("I", [last[key] for key in sorted(last)])),
+        ("words.slots", slots),
+    ]
+    for data_file in lexicon_sources[1:]:
+        lines = read_lines(data_file, lexicon=False)
+        blocks.append((path.basename(data_file), "\n".join(lines).encode("utf8")))
+
+    header = {
+        "sources": {
+            path.basename(data_file): file_checksum(data_file)
+            for data_file in lexicon_sources
+        },
+        "blocks": {},
+    }
+    data, offset = [], 0
+    for name, block in blocks:
+        if isinstance(block, array):
+            if sys.byteorder != "little":
+                block.byteswap()
+            block = block.tobytes()
+        header["blocks"][name] = [offset, len(block)]
+        padding = b"\0" * (-len(block) % 8)
+        data.append(block + padding)
+        offset += len(block) + len(padding)
+
+    encoded = json.dumps(header, sort_keys=True).encode("utf8")
+    start = len(lexicon_magic) + 4 + len(encoded)
+    with open(lexicon_file, "wb") as file:
+        file.write(lexicon_magic + struct.pack("<I", len(encoded)) + encoded)
+        file.write(b"\0" * (-start % 8) + b"".join(data))
+
+
+def load_lexicon(lexicon_file=default_lexicon):
+    """فایل دودوییِ [Lexicon][hazm.utils.Lexicon] را بارگذاری می‌کند.
+    
+    Returns:
+        (Lexicon): نمونهٔ بارگذاری‌شده یا `None` اگر فایل وجود نداشته باشد یا
+            قدیمی باشد.
+    
+    """
+    if not path.exists(lexicon_file):
+        return None
+
+    def load():
+        try:
+            return Lexicon(lexicon_file)
+        except ValueError:
+            return None
+
+    return shared_lexicon("lexicon", [lexicon_file] + lexicon_sources, load)
+
+
+def read_lines(data_file, lexicon=True):
+    """خطوط یک فایل داده را بدون فاصله‌های ابتدا و انتها برمی‌گرداند.
+    
+    اگر فایل یکی از فایل‌های دادهٔ پیش‌فرض باشد، خطوط از فایل دودویی
+    خوانده می‌شوند.
+    
+    Args:
+        data_file (str): مسیر فایل.
+        lexicon (bool, optional): اگر `False` باشد همواره فایل متنی خوانده می‌شود.
+    
+    Returns:
+        (List[str]): خطوط فایل.
+    
+    """
+    if lexicon and data_file in lexicon_sources[1:]:
+        binary = load_lexicon()
+        if binary:
+            return binary.lines(data_file)
+
+    with codecs.open(data_file, encoding="utf8") as lines:
+        return [line.strip() for line in lines]
 
-def words_list(words_file=default_words):
+
+def words_list(words_file=default_words, lexicon=True):
     """لیست کلمات را برمی‌گرداند.
     
     Examples:
@@ -32,11 +353,17 @@ def words_list(words_file=default_words):
     
     Args:
         words_file (str, optional): مسیر فایل حاوی کلمات.
+        lexicon (bool, optional): اگر `True` باشد و فایل دودوییِ به‌روزی برای فایل پیش‌فرض ساخته شده باشد، کلمات از آن خوانده می‌شوند.
     
     Returns:
         (Tuple[str,str,Tuple[str,str]]): فهرست کلمات.
     
     """
+    if lexicon and words_file == default_words:
+        binary = load_lexicon()
+        if binary:
+            return binary.words_list()
+
     with codecs.open(words_file, encoding="utf-8") as words_file:
         items = [line.strip().split("\t") for line in words_file]
         return [
@@ -61,16 +388,11 @@ def stopwords_list(stopwords_file=default_stopwords):
         (List[str]): فهرست ایست‌واژه‌ها.
     
     """
-    with codecs.open(stopwords_file, encoding="utf8") as stopwords_file:
-        return list(set(map(lambda w: w.strip(), stopwords_file)))
+    return list(set(read_lines(stopwords_file)))
 
 
 def verbs_list():
-    with codecs.open(default_verbs, encoding="utf8") as verbs_file:
-        list = []
-        for line in verbs_file:
-            list.append(line.strip())
-        return list
+    return read_lines(default_verbs)
 
 
 def past_roots():
@@ -91,9 +413,35 @@ def present_roots():
     return roots[:-1]
 
 
+def compile_patterns(patterns):
+    return [(re.compile(pattern), repl) for pattern, repl in patterns]
+
+
+def merge_translations(first, second):
+    """دو جدول `translate` را طوری ادغام می‌کند که اعمال جدول حاصل با اعمال
+    پشت‌سرهمِ آن دو یکسان باشد.
+    
+    Examples:
+        >>> merge_translations(maketrans('ك', 'ک'), maketrans('ک', 'گ'))[ord('ك')]
+        'گ'
+    
+    Args:
+        first (Dict[int,str]): جدولی که ابتدا اعمال می‌شود.
+        second (Dict[int,str]): جدولی که روی خروجی جدول اول اعمال می‌شود.
+    
+    Returns:
+        (Dict[int,str]): جدول ادغام‌شده.
+    
+    """
+    merged = dict(second)
+    for char, value in first.items():
+        merged[char] = value.translate(second) if value else value
+    return merged
+
+
 def regex_replace(patterns, text):
     for pattern, repl in patterns:
-        text = re.sub(pattern, repl, text)
+        text = pattern.sub(repl, text)
     return text
 
 
@@ -15,7 +15,7 @@ setup(
     ).read(),
     long_description_content_type="text/markdown",
     packages=["hazm"],
-    package_data={"hazm": ["data/*.dat"]},
+    package_data={"hazm": ["data/*.dat", "data/*.bin", "data/*.java"]},
     classifiers=[
         "Topic :: Text Processing",
         "Natural Language :: Persian",
@@ -28,5 +28,5 @@ setup(
         "License :: OSI Approved :: MIT License",
     ],
     install_requires=["nltk==3.4", 'libwapiti>=0.2.1;platform_system!="Windows"'],
-    extras_require={"wapiti": ["libwapiti>=0.2.1"]},
+    extras_require={"wapiti": ["libwapiti>=0.2.1"], "numpy": ["numpy"]},
 )
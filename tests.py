@@ -28,6 +28,7 @@ modules = {
     "chunker": Chunker,
     "parser": DependencyParser,
     "informal_normalizer": InformalNormalizer,
+    "pipeline": Pipeline,
 }
 
 